@@ -1,14 +1,63 @@
+import logging
+import threading
+import time
 from proxmoxer import ProxmoxAPI
-from typing import Union, Dict, Any, List
+from requests.adapters import HTTPAdapter
+from typing import Union, Dict, Any, List, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# --- CLASSE: TTLCache (Memoização de chamadas da API com expiração) ---
+class TTLCache:
+    """
+    Cache thread-safe de resultados da API com expiração por entrada.
+    Entradas: {key: (timestamp, value)}
+    """
+    def __init__(self):
+        self._entries: Dict[Tuple, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple, ttl: float):
+        """ Retorna (True, valor) se a entrada existe e não expirou, senão (False, None) """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and time.monotonic() - entry[0] < ttl:
+            return True, entry[1]
+        return False, None
+
+    def set(self, key: Tuple, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+
+    def invalidate(self, vmid: Union[str, int, None] = None):
+        """ Remove as entradas de uma VM (chave[1] == vmid) ou todas se vmid for None """
+        with self._lock:
+            if vmid is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if len(k) > 1 and str(k[1]) == str(vmid)]:
+                del self._entries[key]
 
 
 # --- CLASSE: ProxmoxAPIClient (Lida com a API Remota) ---
 class ProxmoxAPIClient:
+    # Tempo de vida (segundos) dos resultados cacheados por endpoint.
+    # ostype/vga praticamente nunca mudam; ações na VM invalidam a entrada na hora
+    VM_CONFIG_TTL = 300.0
+    # IPs vêm do guest agent (o endpoint mais lento); pode ser sobrescrito por
+    # "network_refresh_interval" no configs.json
+    VM_NETWORK_TTL = 15.0
+    
+    # Conexões keep-alive mantidas com o host: cobre o fan-out por VM
+    # (VM_FETCH_WORKERS no worker) mais o worker de métricas
+    HTTP_POOL_SIZE = 16
+
     def __init__(self, host, user, password, totp):
         self.host = host
         self.user = user
         self.password = password
         self.totp = totp
+        self.cache = TTLCache()
         self.proxmox = self._connect()
         # Detecta automaticamente o node correto após a conexão
         self.node = self._detect_node()
@@ -25,6 +74,7 @@ class ProxmoxAPIClient:
                 otp=self.totp, 
                 verify_ssl=False
             )
+            self._configure_session(api)
             # Tente uma chamada simples (e necessária) para validar a conexão/autenticação
             api.nodes.get() 
             return api
@@ -32,6 +82,27 @@ class ProxmoxAPIClient:
             # Se houver qualquer falha (rede, SSL, auth), levante a exceção.
             raise Exception(f"Falha de autenticação ou conexão: {e}")
 
+    def _configure_session(self, api: ProxmoxAPI):
+        """
+        Amplia o pool de conexões da sessão HTTP do proxmoxer. O padrão do requests
+        (10 por host) é menor que o número de chamadas simultâneas de um ciclo, e cada
+        conexão descartada custa um novo handshake TCP/TLS no ciclo seguinte.
+        
+        O proxmoxer não aceita uma sessão externa, então a sessão é obtida pelo
+        backend privado (ProxmoxAPI._backend.get_session()), que existe no proxmoxer
+        2.x (fixado em 2.2.0 no requirements.txt). Se uma atualização mudar essa API,
+        a aplicação continua funcionando com o pool padrão e o aviso fica no log.
+        """
+        try:
+            session = api._backend.get_session()
+        except AttributeError:
+            logger.warning("proxmoxer session not reachable (version change?); keeping the "
+                           "default HTTP pool of 10, below the %d concurrent calls per cycle",
+                           self.HTTP_POOL_SIZE)
+            return
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.HTTP_POOL_SIZE)
+        session.mount("https://", adapter)
+
     def _detect_node(self) -> str:
         """
         Detecta automaticamente o node correto.
@@ -46,12 +117,33 @@ class ProxmoxAPIClient:
         first_node = node_names[0] if node_names else "pve"
         print(f"Node '{first_node}' encontrado. Usando: '{first_node}'")
         return first_node
+
+    def cached_call(self, fn: Callable, ttl: float, *args):
+        """
+        Executa fn(*args) reaproveitando o último resultado se tiver menos de `ttl` segundos.
+        A chave é (nome da função, *args), então o vmid deve ser o primeiro argumento.
+        Resultados None (falha na API) não são cacheados.
+        """
+        key = (fn.__name__,) + args
+        hit, value = self.cache.get(key, ttl)
+        if hit:
+            return value
+        value = fn(*args)
+        if value is not None:
+            self.cache.set(key, value)
+        return value
+
+    def invalidate_vm_cache(self, vmid: Union[str, int, None] = None):
+        """ Descarta os resultados cacheados da VM (ou de todas, se vmid for None) """
+        self.cache.invalidate(vmid)
             
             
     def get_vms_list(self) -> List[Dict[str, Any]]:
         """ 
         Obtém a lista de todas as VMs e Containers (LXC/QEMU) 
         e anexa a chave 'type' a cada item. 
+        Uma única chamada já traz status, cpu/maxcpu e mem/maxmem de todos os guests,
+        dispensando o /status/current por VM no refresh periódico.
         Endpoint: /cluster/resources?type=vm
         """
         all_vms = []
@@ -364,6 +456,7 @@ class ProxmoxAPIClient:
         """ Desliga (stop) a VM """
         try:
             self.proxmox.nodes(self.node).qemu(str(vmid)).status.stop.post()
+            self.invalidate_vm_cache(vmid)
             return True
         except Exception as e:
             print(f"Erro ao desligar VM {vmid}: {e}")
@@ -373,6 +466,7 @@ class ProxmoxAPIClient:
         """ Inicia (start) a VM """
         try:
             self.proxmox.nodes(self.node).qemu(str(vmid)).status.start.post()
+            self.invalidate_vm_cache(vmid)
             return True
         except Exception as e:
             print(f"Erro ao iniciar VM {vmid}: {e}")
@@ -382,6 +476,7 @@ class ProxmoxAPIClient:
         """ Reinicia (reboot) a VM """
         try:
             self.proxmox.nodes(self.node).qemu(str(vmid)).status.reboot.post()
+            self.invalidate_vm_cache(vmid)
             return True
         except Exception as e:
             print(f"Erro ao reiniciar VM {vmid}: {e}")
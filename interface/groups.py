@@ -1,7 +1,10 @@
 import json
+import logging
 import os
 from typing import Dict, List, Any
 
+logger = logging.getLogger(__name__)
+
 # Define the configuration file name for groups
 CONFIG_FILE = './resources/vm_groups.json'
 
@@ -45,7 +48,7 @@ class GroupManager:
                     # Load group expansion state
                     self.group_expansion_state = data.get('group_expansion_state', {})
 
-                print(f"Groups loaded from {CONFIG_FILE}.")
+                logger.debug("Groups loaded from %s.", CONFIG_FILE)
             except json.JSONDecodeError:
                 print(f"Error reading JSON from {CONFIG_FILE}. Initializing empty.")
             except Exception as e:
@@ -75,7 +78,7 @@ class GroupManager:
             os.makedirs(os.path.dirname(CONFIG_FILE), exist_ok=True) 
             with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=4)
-            print(f"Groups saved to {CONFIG_FILE}.")
+            logger.debug("Groups saved to %s.", CONFIG_FILE)
         except Exception as e:
             print(f"Error saving groups: {e}")
 
@@ -244,6 +247,6 @@ class GroupManager:
             with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
                 json.dump(existing_data, f, indent=4)
                 
-            print(f"Group expansion state saved to {CONFIG_FILE}.")
+            logger.debug("Group expansion state saved to %s.", CONFIG_FILE)
         except Exception as e:
             print(f"Error saving group expansion state: {e}")
\ No newline at end of file
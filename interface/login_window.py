@@ -1,13 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QLineEdit, QMessageBox, QGridLayout, 
-    QDesktopWidget, QLabel, QPushButton, QCheckBox, QProgressBar
+    QLabel, QPushButton, QCheckBox, QProgressBar
 )
 from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
-from PyQt5.QtGui import QFont
+from PyQt5.QtGui import QFont, QGuiApplication
 from utils.config_manager import ConfigManager
 from api import ProxmoxAPIClient, ViewerConfigGenerator, ProxmoxController
 from utils import set_dark_title_bar
 from .main_window import MainWindow 
+from .worker import fetch_vm_details, VM_FETCH_WORKERS
 
 
 class LoadingWorker(QThread):
@@ -21,47 +23,10 @@ class LoadingWorker(QThread):
     
     def load_vm_data(self, vm):
         """Carrega dados de uma VM individual (executado em paralelo)"""
-        vmid = vm.get('vmid')
-        vm_type = vm.get('type')
-        
-        if vmid is None or vm_type is None:
-            return None
-        
-        # Get detailed status
-        try:
-            detailed_status = self.controller.api_client.get_vm_current_status(vmid, vm_type)
-            if detailed_status:
-                vm.update(detailed_status)
-        except:
-            pass
-        
-        # Get config
-        try:
-            vm_config = self.controller.api_client.get_vm_config(vmid, vm_type)
-            if vm_config:
-                if 'ostype' in vm_config:
-                    vm['ostype'] = vm_config['ostype']
-                if 'vga' in vm_config:
-                    vm['vga'] = vm_config['vga']
-        except:
-            pass
-        
-        # Get IPs
-        if vm.get('status') == 'running':
-            try:
-                ip_addresses = self.controller.api_client.get_vm_network_info(vmid, vm_type)
-                vm['ip_addresses'] = ip_addresses
-            except:
-                vm['ip_addresses'] = []
-        else:
-            vm['ip_addresses'] = []
-        
-        return vm
+        return fetch_vm_details(self.controller.api_client, vm)
     
     def run(self):
         try:
-            from concurrent.futures import ThreadPoolExecutor, as_completed
-            
             # Carrega apenas os DADOS em thread (não cria widgets)
             node_data = None
             vms_list = []
@@ -78,7 +43,7 @@ class LoadingWorker(QThread):
                 
                 if raw_vms:
                     # Usa ThreadPoolExecutor para carregar dados de VMs em paralelo
-                    with ThreadPoolExecutor(max_workers=10) as executor:
+                    with ThreadPoolExecutor(max_workers=VM_FETCH_WORKERS) as executor:
                         # Submete todas as VMs para processamento paralelo
                         future_to_vm = {executor.submit(self.load_vm_data, vm): vm for vm in raw_vms}
                         
@@ -134,7 +99,7 @@ class LoginWindow(QMainWindow):
     def center(self):
         """ Centraliza a janela na tela do monitor. """
         qr = self.frameGeometry()
-        cp = QDesktopWidget().availableGeometry().center()
+        cp = QGuiApplication.primaryScreen().availableGeometry().center()
         qr.moveCenter(cp)
         self.move(qr.topLeft())
 
@@ -190,20 +155,6 @@ class LoginWindow(QMainWindow):
                 spacing: 5px;
                 margin-top: 10px;
             }
-            QCheckBox::indicator {
-                width: 15px;
-                height: 15px;
-            }
-            QCheckBox::indicator:unchecked {
-                border: 1px solid #555555;
-                background-color: #383838;
-                border-radius: 3px;
-            }
-            QCheckBox::indicator:checked {
-                border: 1px solid #00A3CC;
-                background-color: #00A3CC;
-                border-radius: 3px;
-            }
         """)
         form_layout.addWidget(self.auto_login_check, 4, 0, 1, 2)
 
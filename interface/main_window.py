@@ -1,28 +1,62 @@
 import datetime
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional, Tuple
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QScrollArea, QDesktopWidget, QPushButton, QMessageBox, 
+    QScrollArea, QPushButton, QMessageBox, 
     QLineEdit, QComboBox, QFrame, QSizePolicy, QDialog, 
-    QDialogButtonBox, QFormLayout, QGroupBox, QCheckBox, QTabWidget
+    QDialogButtonBox, QGridLayout, QGroupBox, QCheckBox, QTabWidget
 )
 from PyQt5.QtCore import (
-    Qt, QTimer, QSize, QThreadPool, pyqtSlot, QPoint, QPropertyAnimation, QRect, QEasingCurve
+    Qt, QTimer, QSize, QThreadPool, pyqtSlot, QPoint, QPropertyAnimation, QRect, QEasingCurve,
+    QEvent, QByteArray
 )
-from PyQt5.QtGui import QFont
+from PyQt5.QtGui import QFont, QGuiApplication, QPalette, QColor
 # Importações relativas
 from .widgets import VMWidget
 from .tree_widget import VMTreeWidget
-from api import ProxmoxController 
+from api import ProxmoxController, ProxmoxAPIClient
 from utils.utilities import set_dark_title_bar 
 from utils.config_manager import ConfigManager
 from utils import ProcessManager
-from .worker import Worker, WorkerSignals 
+from .worker import Worker, WorkerSignals, ProgressiveVMWorker
+from .styles import MAIN_WINDOW_STYLESHEET, SIDEBAR_STYLESHEET, SIDEBAR_OBJECT_NAMES, set_style_property
+
+logger = logging.getLogger(__name__)
+
+# Texto do footer, montado uma vez na importação
+COPYRIGHT_HTML = (
+    f"© {datetime.datetime.now().year} <a href='https://github.com/pauloswear/proxmanager' "
+    "style='text-decoration: none;'>Paulo Henrique</a>"
+)
+
+# Menor intervalo (s) aceito para "network_refresh_interval" no configs.json
+MIN_NETWORK_REFRESH_INTERVAL = 1.0
+
+VM_COUNTS_HTML = (
+    "VMs: <span style='color: #4CAF50;'>{online} online</span>, "
+    "<span style='color: #F44336;'>{offline} offline</span>"
+)
 
 
 class MainWindow(QMainWindow):
     """Main window for managing and viewing VMs and Node status."""
     
+    # Um worker rodando há mais que N intervalos de atualização é cancelado e substituído
+    STALE_WORKER_FACTOR = 5
+    
+    # Acima deste número de VMs o apply_filters roda no threadpool
+    FILTER_OFFLOAD_THRESHOLD = 200
+    
+    # Viewers SPICE iniciados em paralelo pelo "Connect All SPICE VMs"
+    SPICE_CONNECT_WORKERS = 8
+    
+    # Sem mudança (CPU do node/status das VMs) por N ciclos, o intervalo dobra até o teto
+    IDLE_CYCLES_BEFORE_BACKOFF = 3
+    MAX_POLL_INTERVAL = 10000
+    
     def __init__(self, controller: ProxmoxController):
         super().__init__()
         set_dark_title_bar(self.winId())
@@ -36,18 +70,30 @@ class MainWindow(QMainWindow):
         
         # Load configurations
         configs = self.config_manager.load_configs()
-        self.timer_interval = 1000  
+        self.timer_interval = 2000  # Estado das VMs raramente muda em menos de 2s
+        self.poll_interval = self.timer_interval  # Intervalo atual (cresce quando nada muda)
+        self.idle_cycles = 0
+        self.last_activity_key = None
+        self.node_cpu_bucket = None  # CPU do node em faixas de 10%
+        # Intervalo (s) entre consultas de IP de cada VM ao guest agent
+        self.controller.api_client.VM_NETWORK_TTL = self._network_refresh_interval(configs)
         
         # Track separate API requests
         self.metrics_running = False
         self.vms_running = False
+        self.updates_paused = False
+        self.current_metrics_worker = None
+        self.current_vms_worker = None
+        self.current_filter_worker = None
+        self.metrics_started_at = 0.0
+        self.vms_started_at = 0.0
         
         self.threadpool = QThreadPool()
 
         node_name = self.controller.api_client.node if hasattr(self.controller.api_client, 'node') else 'N/A'
         self.setWindowTitle(f"ProxManager - Node: {node_name}")
         
-        self.setStyleSheet("background-color: #1E1E1E; color: white;") 
+        self.setStyleSheet(MAIN_WINDOW_STYLESHEET)
         
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -69,9 +115,37 @@ class MainWindow(QMainWindow):
         # Filter variables
         self.current_search_text = ""
         self.current_status_filter = "ALL"
-        self.unfiltered_vms_list = []  # Store original VM list
+        self.unfiltered_vms: Dict[int, Dict[str, Any]] = {}  # Original VMs keyed by vmid
+        self.online_count = 0  # Running VMs in unfiltered_vms (kept incrementally)
+        self.vms_version = 0  # Incrementado sempre que unfiltered_vms muda de fato
+        self.last_filter_key = None  # Entradas do último apply_filters aplicado
+        
+        # Último conteúdo aplicado no footer (evita setText/setStyleSheet repetidos)
+        self.last_metrics_html = None
+        self.last_vm_counts = None  # (online, offline) exibidos
+        self.last_dot_state = None
+        self.saved_window_state = None  # Geometria (base64) restaurada em load_geometry
+        self.screen_center = None  # Centro da área útil da tela principal (calculado no center)
+        self.pending_node_messages = None  # Mensagens do comando de node em andamento
+        self.action_busy = False  # Restart/shutdown/logout em confirmação ou execução
+        self.counters_dirty = False  # Atualização de contadores agendada (request_counters_refresh)
+        self.spice_connect_running = False  # "Connect All SPICE VMs" em andamento
+        self.settings_dialog = None  # Criado na primeira abertura e reutilizado
         self.current_view_mode = "all"  # "all" ou "active"
         
+        # Debounce dos filtros (um único apply_filters por rajada de digitação/troca de status)
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(150)
+        self.filter_timer.timeout.connect(self.apply_filters)
+        
+        # VMs recebidas do ProgressiveVMWorker aguardando o próximo flush (por vmid)
+        self.pending_vm_updates: Dict[int, Dict[str, Any]] = {}
+        self.progress_flush_timer = QTimer(self)
+        self.progress_flush_timer.setSingleShot(True)
+        self.progress_flush_timer.setInterval(50)
+        self.progress_flush_timer.timeout.connect(self.flush_vm_progress)
+        
         # Search menu state
         self.search_expanded = False  # Start collapsed
         self.search_animation = None
@@ -84,10 +158,9 @@ class MainWindow(QMainWindow):
         # Load geometry after all UI is setup (delayed to ensure proper rendering)
         QTimer.singleShot(50, self.load_geometry)
         
-        # Don't call initial_load here - it will be called from LoginWindow
-        
-        # Single timer for all updates - waits for API response
+        # Single-shot timer for updates - rearmed only after both workers finish
         self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
         self.timer.timeout.connect(self.run_update_in_thread)
         self.timer.start(self.timer_interval)
         
@@ -99,20 +172,46 @@ class MainWindow(QMainWindow):
     def cleanup_dead_processes(self):
         """Limpa processos mortos e atualiza botões"""
         try:
-            self.process_manager.cleanup_dead_processes()
-            # Força atualização dos botões de todas as VMs (se tree não estiver sendo reconstruída)
-            if hasattr(self.tree_widget, 'is_dragging') and not self.tree_widget.is_dragging:
-                self.tree_widget.update_all_vm_buttons()
+            dead_vmids = self.process_manager.cleanup_dead_processes()
+            tracked_vmids = set(self.process_manager.processes)
+            # Nenhuma conexão aberta nem encerrada: nada a atualizar
+            if not dead_vmids and not tracked_vmids:
+                return
+            # Só as VMs com conexão (estado +/- da janela) ou cuja conexão acabou
+            # de encerrar (se a tree não estiver sendo reconstruída)
+            if not self.tree_widget.is_dragging:
+                self.tree_widget.update_all_vm_buttons(tracked_vmids.union(dead_vmids))
             # Atualiza contador de conexões ativas
-            self.update_active_connections_count()
+            if dead_vmids:
+                self.request_counters_refresh()
         except (RuntimeError, AttributeError):
             # Se tree estiver sendo reconstruída, ignora esta atualização
             pass
     
+    def request_counters_refresh(self):
+        """Marks the counters dirty; several requests in one event-loop pass run a single update"""
+        if self.counters_dirty:
+            return
+        self.counters_dirty = True
+        QTimer.singleShot(0, self.flush_counters)
+    
+    def flush_counters(self):
+        """Runs the pending counter update (once per request_counters_refresh burst)"""
+        if not self.counters_dirty:
+            return
+        self.counters_dirty = False
+        try:
+            self.update_active_connections_count()
+        except RuntimeError:
+            # Janela já destruída
+            pass
+    
     def update_active_connections_count(self):
         """Atualiza o contador de conexões ativas no botão"""
         count = len(self.process_manager.processes)
-        self.active_connections_btn.setText(f"Active Connections ({count})")
+        text = f"Active Connections ({count})"
+        if text != self.active_connections_btn.text():
+            self.active_connections_btn.setText(text)
         
         # Se está na visualização de conexões ativas, reaplica o filtro
         if self.current_view_mode == "active":
@@ -123,222 +222,283 @@ class MainWindow(QMainWindow):
     # --- Métodos de Threading
     # --------------------------------------------------------------------------
 
-    def initial_load(self):
-        """Loads the dashboard for the first time synchronously."""
-        try:
-            # Load metrics first (usually faster)
-            try:
-                node_data = self.controller.api_client.get_node_status()
-                if node_data:
-                    self.update_node_metrics(node_data)
-            except Exception:
-                pass  # Continue even if metrics fail
-            
-            # Load VMs list
-            try:
-                vms_list = self.get_vms_only()
-                if vms_list:
-                    self.update_vms_widgets(vms_list)
-            except Exception:
-                pass  # Continue even if VMs fail
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Falha na Conexão Inicial", 
-                                 f"Não foi possível conectar ou carregar dados do Proxmox.\n\nDetalhes: {e}", 
-                                 QMessageBox.Ok)
-            
     def run_update_in_thread(self):
         """Starts separate updates for metrics and VMs - updates as they respond."""
+        # Called by the timer or by a VM action; the next tick is scheduled on finish
+        self.timer.stop()
+        if self.is_backgrounded():
+            # Watchdog que disparou com a janela oculta: resume_background_updates retoma ao voltar
+            return
+        now = time.monotonic()
+        stale_after = self.stale_worker_timeout() / 1000.0
+        
+        # A worker that is still running is only replaced once it is considered stuck
+        if self.metrics_running and now - self.metrics_started_at >= stale_after:
+            logger.warning("Metrics request running for %.1fs, restarting", now - self.metrics_started_at)
+            self.current_metrics_worker.cancel()
+            self.metrics_running = False
+        
+        if self.vms_running and now - self.vms_started_at >= stale_after:
+            logger.warning("VMs request running for %.1fs, restarting", now - self.vms_started_at)
+            self.current_vms_worker.cancel()
+            self.vms_running = False
         
         # Start metrics update if not already running
         if not self.metrics_running:
             self.metrics_running = True
+            self.metrics_started_at = now
             metrics_worker = Worker(self.controller.api_client.get_node_status)
             metrics_worker.signals.result.connect(self.handle_metrics_result)
             metrics_worker.signals.error.connect(self.handle_metrics_error)
+            self.current_metrics_worker = metrics_worker
             self.threadpool.start(metrics_worker)
         
         # Start VMs update if not already running - USANDO PROGRESSIVE WORKER
         if not self.vms_running:
             self.vms_running = True
+            self.vms_started_at = now
             
-            from .worker import ProgressiveVMWorker
             vms_worker = ProgressiveVMWorker(self.controller.api_client)
             vms_worker.signals.progress.connect(self.handle_vm_progress)
             vms_worker.signals.finished.connect(self.handle_vms_finished)
             vms_worker.signals.error.connect(self.handle_vms_error)
+            self.current_vms_worker = vms_worker
             self.threadpool.start(vms_worker)
-
-    @pyqtSlot(object)
-    def handle_update_result(self, result: Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]):
-        """ Recebe o resultado da thread, atualiza a GUI e reinicia o timer. """
         
-        if result and isinstance(result, tuple) and len(result) == 2:
-            node_data, vms_list = result
-            self.update_gui_with_data(node_data, vms_list)
-
-        # Restart timer after response is processed
-        self.timer.start(self.timer_interval)
+        # Arms the watchdog tick while the workers run
+        self.schedule_next_update()
 
     @pyqtSlot(object)
     def handle_metrics_result(self, result):
         """Handle metrics response - update immediately"""
+        if not self.is_current_worker(self.current_metrics_worker):
+            return
         if result:
+            self.node_cpu_bucket = int(result.get('cpu', 0.0) * 10)
             self.update_node_metrics(result)
         self.metrics_running = False
+        self.schedule_next_update()
 
     @pyqtSlot(tuple)
     def handle_metrics_error(self, error):
         """Handle metrics error"""
+        if not self.is_current_worker(self.current_metrics_worker):
+            return
         self.metrics_running = False
+        self.schedule_next_update()
 
-    @pyqtSlot(object)
-    def handle_vms_result(self, result):
-        """Handle VMs response - update immediately"""
-        if result:
-            self.update_vms_widgets(result)
-        self.vms_running = False
-    
     @pyqtSlot(object)
     def handle_vm_progress(self, vm_data):
-        """Handle individual VM as it becomes ready (progressive update)"""
-        # Adiciona ou atualiza a VM na lista
-        vmid = vm_data.get('vmid')
-        
-        # Atualiza a lista não filtrada
-        found = False
-        for i, vm in enumerate(self.unfiltered_vms_list):
-            if vm.get('vmid') == vmid:
-                self.unfiltered_vms_list[i] = vm_data
-                found = True
-                break
+        """Queues each VM as it becomes ready; the batch is applied by flush_vm_progress"""
+        if not self.is_current_worker(self.current_vms_worker):
+            return
+        self.pending_vm_updates[vm_data.get('vmid')] = vm_data
+        # Não reinicia um timer já armado: a latência máxima fica em um intervalo
+        if not self.progress_flush_timer.isActive():
+            self.progress_flush_timer.start()
+    
+    def flush_vm_progress(self):
+        """Applies all queued VM updates with a single tree pass and counter refresh"""
+        self.progress_flush_timer.stop()
+        if not self.pending_vm_updates:
+            return
         
-        if not found:
-            self.unfiltered_vms_list.append(vm_data)
+        batch = self.pending_vm_updates
+        self.pending_vm_updates = {}
         
-        # Atualiza a UI imediatamente para esta VM
-        self.tree_widget.update_single_vm(vm_data)
+        # Adiciona ou atualiza as VMs (O(1) pelo vmid) mantendo o contador online.
+        # Chegam já indexadas pelo worker (index_vm)
+        changed = False
+        for vmid, vm_data in batch.items():
+            previous = self.unfiltered_vms.get(vmid)
+            if previous == vm_data:
+                continue
+            changed = True
+            if previous is not None and previous['_running']:
+                self.online_count -= 1
+            self.unfiltered_vms[vmid] = vm_data
+            if vm_data['_running']:
+                self.online_count += 1
+        
+        if not changed:
+            return
+        self.vms_version += 1
         
-        # Atualiza contadores
+        # A árvore compara com o layout atual: sem mudança de ordem/grupos só os
+        # widgets alterados são atualizados; VMs novas e mudanças de status
+        # (filtro/ordenação) também entram aqui
+        self.apply_filters()
         self.update_vm_counts()
     
     @pyqtSlot()
     def handle_vms_finished(self):
         """Called when all VMs have been loaded"""
+        if not self.is_current_worker(self.current_vms_worker):
+            return
+        self.flush_vm_progress()
         self.vms_running = False
+        self.track_activity()
+        self.schedule_next_update()
     
-    def update_vm_counts(self):
-        """Update VM counts in footer"""
-        online_count = sum(1 for vm in self.unfiltered_vms_list if vm.get('status') == 'running')
-        offline_count = sum(1 for vm in self.unfiltered_vms_list if vm.get('status') != 'running')
-        
-        if hasattr(self, 'vm_counts'):
-            try:
-                vm_text = f"VMs: <span style='color: #4CAF50;'>{online_count} online</span>, <span style='color: #F44336;'>{offline_count} offline</span>"
-                self.vm_counts.setText(vm_text)
-                
-                # Update status dot
-                if hasattr(self, 'status_dot'):
-                    if online_count > 0:
-                        dot_color = "#4CAF50"
-                    elif offline_count > 0:
-                        dot_color = "#F44336"
-                    else:
-                        dot_color = "#666666"
-                    
-                    self.status_dot.setStyleSheet(f"""
-                        QLabel {{
-                            color: {dot_color};
-                            font-size: 10pt;
-                        }}
-                    """)
-            except RuntimeError:
-                pass
+    def track_activity(self):
+        """Backs the poll interval off when a whole cycle brought no relevant change"""
+        activity_key = (self.node_cpu_bucket,
+                        tuple(vm.get('status') for vm in self.unfiltered_vms.values()))
+        if activity_key != self.last_activity_key:
+            self.last_activity_key = activity_key
+            self.idle_cycles = 0
+            self.poll_interval = self.timer_interval
+            return
+        
+        self.idle_cycles += 1
+        if self.idle_cycles >= self.IDLE_CYCLES_BEFORE_BACKOFF:
+            self.idle_cycles = 0
+            self.poll_interval = min(self.poll_interval * 2, self.MAX_POLL_INTERVAL)
+    
+    def reset_poll_interval(self):
+        """Back to the fast cadence after a user action"""
+        self.idle_cycles = 0
+        self.poll_interval = self.timer_interval
+        if self.timer.isActive() and not (self.metrics_running or self.vms_running):
+            self.timer.start(self.current_update_interval())
 
-    @pyqtSlot(tuple)
-    def handle_vms_error(self, error):
-        """Handle VMs error"""
+    def schedule_next_update(self):
+        """Arms the next update once both metrics and VMs workers are idle"""
+        if self.updates_paused:
+            return
+        if self.metrics_running or self.vms_running:
+            # Watchdog: se um worker travar, o próximo tick o cancela e reinicia
+            self.timer.start(self.stale_worker_timeout())
+            return
+        if self.is_backgrounded():
+            # Oculta/minimizada: sem polling; resume_background_updates atualiza ao voltar
+            self.timer.stop()
+            return
+        self.timer.start(self.current_update_interval())
+    
+    def stale_worker_timeout(self) -> int:
+        """Time (ms) after which a running worker is considered stuck"""
+        return self.STALE_WORKER_FACTOR * self.current_update_interval()
+    
+    def is_current_worker(self, worker) -> bool:
+        """True if the signal being handled comes from the given (current) worker"""
+        # Sinais de um worker cancelado ainda podem estar na fila de eventos
+        return worker is not None and self.sender() is worker.signals
+    
+    def cancel_workers(self):
+        """Cancels the in-flight metrics/VMs workers (their results are discarded)"""
+        for worker in (self.current_metrics_worker, self.current_vms_worker):
+            if worker is not None:
+                worker.cancel()
+        self.current_metrics_worker = None
+        self.current_vms_worker = None
+        self.metrics_running = False
         self.vms_running = False
 
-    def get_vms_only(self):
-        """Get only VMs list with detailed status"""
-        updated_vms_list = []
+    def current_update_interval(self) -> int:
+        """Current polling interval (ms), raised by the adaptive backoff while nothing changes"""
+        return self.poll_interval
+    
+    def is_backgrounded(self) -> bool:
+        """True while the window is hidden or minimized"""
+        return not self.isVisible() or self.isMinimized()
+    
+    def update_vm_counts(self):
+        """Update VM counts in footer (uses the incrementally maintained counters)"""
+        online_count = self.online_count
+        offline_count = len(self.unfiltered_vms) - online_count
+        
+        # Footer é criado no __init__; RuntimeError cobre widgets já destruídos
         try:
-            # Get basic VMs list
-            vms_list = self.controller.api_client.get_vms_list()
+            # O HTML só é montado quando os números mudam
+            if (online_count, offline_count) != self.last_vm_counts:
+                self.last_vm_counts = (online_count, offline_count)
+                self.vm_counts.setText(VM_COUNTS_HTML.format(online=online_count, offline=offline_count))
             
-            if vms_list:
-                for vm in vms_list:
-                    vmid = vm.get('vmid')
-                    vm_type = vm.get('type')
-                    
-                    if vmid is None or vm_type is None:
-                        continue 
-                        
-                    # Get detailed status for each VM
-                    detailed_status = self.controller.api_client.get_vm_current_status(vmid, vm_type)
-                    
-                    if detailed_status:
-                        vm.update(detailed_status)
-                    
-                    # Busca ostype e vga (display type) da configuração da VM
-                    vm_config = self.controller.api_client.get_vm_config(vmid, vm_type)
-                    if vm_config:
-                        if 'ostype' in vm_config:
-                            vm['ostype'] = vm_config['ostype']
-                        if 'vga' in vm_config:
-                            vm['vga'] = vm_config['vga']
-                    
-                    # Busca informações de rede (IP addresses) apenas se a VM estiver rodando
-                    if vm.get('status') == 'running':
-                        try:
-                            ip_addresses = self.controller.api_client.get_vm_network_info(vmid, vm_type)
-                            vm['ip_addresses'] = ip_addresses
-                        except Exception as e:
-                            vm['ip_addresses'] = []
-                    else:
-                        vm['ip_addresses'] = []
-                        
-                    updated_vms_list.append(vm)
-                    
-            return updated_vms_list
+            # Update status dot
+            if online_count > 0:
+                dot_state = "online"  # Green if any VMs online
+            elif offline_count > 0:
+                dot_state = "offline"  # Red if only offline VMs
+            else:
+                dot_state = "empty"  # Gray if no VMs
             
-        except Exception as e:
-            raise e
+            if dot_state == self.last_dot_state:
+                return
+            self.last_dot_state = dot_state
+            set_style_property(self.status_dot, "state", dot_state)
+        except RuntimeError:
+            pass
 
     @pyqtSlot(tuple)
-    def thread_error(self, error: Tuple[type, BaseException, str]):
-        """ Lida com erros da API que ocorreram na thread e reinicia o timer. """
-        exctype, value, traceback_str = error
-        
-        QMessageBox.critical(self.centralWidget(), "Falha na Atualização (Thread)", 
-                             f"Não foi possível atualizar o Proxmox.\n\nDetalhes do Erro: {value}", 
-                             QMessageBox.Ok)
-        
-        # Restart timer even on error
-        self.timer.start(self.timer_interval)
+    def handle_vms_error(self, error):
+        """Handle VMs error"""
+        if not self.is_current_worker(self.current_vms_worker):
+            return
+        self.vms_running = False
 
     def pause_timer(self):
         """Pauses the update timer during drag operations"""
+        self.updates_paused = True
         self.timer.stop()
 
     def resume_timer(self):
         """Resumes the update timer after drag operations"""
-        self.timer.start(self.timer_interval)
+        self.updates_paused = False
+        self.schedule_next_update()
+
+    def pause_background_updates(self):
+        """Window hidden/minimized: stops the process cleanup and the pending poll"""
+        self.cleanup_timer.stop()
+        # Também o watchdog de um worker em andamento; resume_background_updates o rearma
+        self.timer.stop()
+    
+    def resume_background_updates(self):
+        """Window visible again: restarts the cleanup and refreshes right away (data is stale)"""
+        if self.is_backgrounded():
+            return
+        if not self.cleanup_timer.isActive():
+            self.cleanup_timer.start()
+        if self.updates_paused or self.timer.isActive():
+            return
+        if self.metrics_running or self.vms_running:
+            # Worker ainda em andamento: só rearma o watchdog
+            self.schedule_next_update()
+            return
+        self.run_update_in_thread()
+
+    def showEvent(self, event):
+        """Window shown (again) - resumes polling"""
+        super().showEvent(event)
+        self.resume_background_updates()
+
+    def hideEvent(self, event):
+        """Window hidden - no polling until it is shown again"""
+        super().hideEvent(event)
+        self.pause_background_updates()
+
+    def changeEvent(self, event):
+        """Pauses polling while minimized and resumes it on restore"""
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            if self.isMinimized():
+                self.pause_background_updates()
+            else:
+                self.resume_background_updates()
 
     # --------------------------------------------------------------------------
     # --- Filter Methods
     # --------------------------------------------------------------------------
     
     def on_search_changed(self, text: str):
-        """Called when search text changes"""
+        """Called when search text changes - filtering is debounced"""
         self.current_search_text = text.strip().lower()
-        self.apply_filters()
+        self.filter_timer.start()  # Reinicia o timer a cada tecla
     
     def on_status_filter_changed(self, status: str):
-        """Called when status filter changes"""
+        """Called when status filter changes - debounced like the search (wheel over the combo)"""
         self.current_status_filter = status
-        self.apply_filters()
+        self.filter_timer.start()
     
     def has_active_filters(self) -> bool:
         """Check if any filters are currently active"""
@@ -350,10 +510,18 @@ class MainWindow(QMainWindow):
     
     def clear_filters(self):
         """Clears all filters"""
-        self.search_field.clear()
-        self.status_combo.setCurrentText("ALL")
+        # Sem sinais: os slots só reagendariam o filter_timer que é parado logo abaixo
+        self.search_field.blockSignals(True)
+        self.status_combo.blockSignals(True)
+        try:
+            self.search_field.clear()
+            self.status_combo.setCurrentText("ALL")
+        finally:
+            self.search_field.blockSignals(False)
+            self.status_combo.blockSignals(False)
         self.current_search_text = ""
         self.current_status_filter = "ALL"
+        self.filter_timer.stop()
         self.apply_filters()
 
     def toggle_search_menu(self):
@@ -371,7 +539,7 @@ class MainWindow(QMainWindow):
             self.search_animation.setStartValue(self.filter_container.height())
             self.search_animation.setEndValue(0)
             # Atualiza estilo do botão sidebar para indicar estado inativo
-            self.search_sidebar_btn.setStyleSheet(self._get_sidebar_icon_style())
+            self._set_sidebar_button_active(self.search_sidebar_btn, False)
             self.search_expanded = False
         else:
             # Expand - show entire container
@@ -380,59 +548,88 @@ class MainWindow(QMainWindow):
             self.search_animation.setStartValue(0)
             self.search_animation.setEndValue(target_height)
             # Atualiza estilo do botão sidebar para indicar estado ativo
-            self.search_sidebar_btn.setStyleSheet(self._get_sidebar_icon_style(active=True))
+            self._set_sidebar_button_active(self.search_sidebar_btn, True)
             self.search_expanded = True
         
         self.search_animation.start()
     
     def apply_filters(self):
         """Applies current filters to the VM list"""
-        if not self.unfiltered_vms_list:
+        if not self.unfiltered_vms:
             return
         
-        filtered_vms = []
-        
-        for vm in self.unfiltered_vms_list:
-            # Apply search filter
-            vm_name = vm.get('name', '').lower()
-            vm_id = str(vm.get('vmid', ''))
-            
-            search_match = (
-                not self.current_search_text or 
-                self.current_search_text in vm_name or
-                self.current_search_text in vm_id
-            )
-            
-            # Apply status filter
-            vm_status = vm.get('status', 'unknown').upper()
-            status_match = (
-                self.current_status_filter == "ALL" or
-                (self.current_status_filter == "RUNNING" and vm_status == "RUNNING") or
-                (self.current_status_filter == "STOPPED" and vm_status != "RUNNING")
-            )
-            
-            # Apply active connections filter
-            vmid = vm.get('vmid')
-            active_match = (
-                self.current_view_mode == "all" or
-                (self.current_view_mode == "active" and self.process_manager.has_active_process(vmid))
-            )
-            
-            if search_match and status_match and active_match:
-                filtered_vms.append(vm)
+        # Nada mudou (filtros, dados ou conexões ativas no modo "active"): nada a refazer
+        active_vmids = tuple(self.process_manager.processes) if self.current_view_mode == "active" else None
+        filter_key = (self.current_search_text, self.current_status_filter,
+                      self.current_view_mode, active_vmids, self.vms_version)
+        if filter_key == self.last_filter_key:
+            return
+        self.last_filter_key = filter_key
+        
+        vms = list(self.unfiltered_vms.values())
+        
+        # Frotas grandes: filtra fora da thread da GUI, descartando o filtro anterior ainda em curso
+        if len(vms) > self.FILTER_OFFLOAD_THRESHOLD:
+            if self.current_filter_worker is not None:
+                self.current_filter_worker.cancel()
+            filter_worker = Worker(self.filter_vms, vms, self.current_search_text,
+                                   self.current_status_filter, self.current_view_mode, active_vmids)
+            filter_worker.signals.result.connect(self.handle_filter_result)
+            self.current_filter_worker = filter_worker
+            self.threadpool.start(filter_worker)
+            return
         
+        self.current_filter_worker = None
+        self.show_filtered_vms(self.filter_vms(vms, self.current_search_text, self.current_status_filter,
+                                               self.current_view_mode, active_vmids))
+    
+    @staticmethod
+    def filter_vms(vms: List[Dict[str, Any]], search_text: str, status_filter: str,
+                   view_mode: str, active_vmids: Optional[Tuple[int, ...]]) -> List[Dict[str, Any]]:
+        """Returns the VMs matching the filters (pure function - safe to run in a worker thread)"""
+        # Cada filtro ativo é uma passada sobre o que sobrou do anterior, do mais barato
+        # ao mais caro; filtros inativos não custam nada por VM
+        filtered_vms = list(vms)
+        
+        # Apply status filter
+        if status_filter != "ALL":
+            want_running = status_filter == "RUNNING"
+            filtered_vms = [vm for vm in filtered_vms if vm['_running'] is want_running]
+        
+        # Apply search filter
+        if search_text:
+            filtered_vms = [vm for vm in filtered_vms if search_text in vm['_search_blob']]
+        
+        # Apply active connections filter
+        if view_mode == "active":
+            active = frozenset(active_vmids)
+            filtered_vms = [vm for vm in filtered_vms if vm.get('vmid') in active]
+        
+        return filtered_vms
+    
+    @pyqtSlot(object)
+    def handle_filter_result(self, filtered_vms):
+        """Shows the result of an off-thread filter (ignored if a newer filter was started)"""
+        if not self.is_current_worker(self.current_filter_worker):
+            return
+        self.current_filter_worker = None
+        self.show_filtered_vms(filtered_vms)
+    
+    def show_filtered_vms(self, filtered_vms: List[Dict[str, Any]]):
+        """Updates the results label and the tree with the filtered VMs"""
         # Update results count
-        total_count = len(self.unfiltered_vms_list)
+        total_count = len(self.unfiltered_vms)
         filtered_count = len(filtered_vms)
         
         # Se está no modo "active", mostra quantas conexões ativas
         if self.current_view_mode == "active":
-            active_count = len(self.process_manager.processes)
-            self.results_label.setText(f"{filtered_count} active connections")
+            results_text = f"{filtered_count} active connections"
         elif filtered_count == total_count:
-            self.results_label.setText(f"{total_count} servers")
+            results_text = f"{total_count} servers"
         else:
-            self.results_label.setText(f"{filtered_count} of {total_count} servers")
+            results_text = f"{filtered_count} of {total_count} servers"
+        if results_text != self.results_label.text():
+            self.results_label.setText(results_text)
         
         # Update tree with filtered data
         # If filters are active, expand groups that contain results
@@ -442,110 +639,66 @@ class MainWindow(QMainWindow):
     # --- Dashboard Methods
     # --------------------------------------------------------------------------
 
-    def update_gui_with_data(self, node_data: Optional[Dict[str, Any]], vms_list: Optional[List[Dict[str, Any]]]):
-        """ Função central para atualizar a GUI após a thread ter coletado os dados. """
-        self.update_node_metrics(node_data)
-        self.update_vms_widgets(vms_list)
-
-
     def update_node_metrics(self, status_data: Optional[Dict[str, Any]]):
         """ Atualiza as métricas do Node usando dados fornecidos. """
-        
-        # Check if widgets still exist
-        if not hasattr(self, 'system_metrics') or not self.system_metrics:
-            return
-            
         try:
             if not status_data:
-                self.system_metrics.setText("CPU: -- | RAM: --")
-                return
-                
-            cpu_usage = status_data.get('cpu', 0.0) * 100
-            
-            mem_total = status_data.get('memory', {}).get('total', 0)
-            mem_used = status_data.get('memory', {}).get('used', 0)
-            
-            if mem_total > 0:
-                mem_percent = (mem_used / mem_total) * 100
-                mem_used_gb = mem_used / (1024**3)
-                mem_total_gb = mem_total / (1024**3)
-                mem_str = f"{mem_percent:.0f}% ({mem_used_gb:.1f}/{mem_total_gb:.1f}GB)"
+                metrics_html = "CPU: -- | RAM: --"
             else:
-                mem_str = "--"
-                mem_percent = 0
-
-            # Define colors based on usage
-            cpu_color = "#4CAF50" if cpu_usage < 70 else "#FF9800" if cpu_usage < 90 else "#F44336"
-            ram_color = "#4CAF50" if mem_percent < 70 else "#FF9800" if mem_percent < 90 else "#F44336"
-
-            # Update the compact metrics display with colors
-            metrics_html = f"<span style='color: #CCCCCC;'>CPU:</span> <span style='color: {cpu_color};'>{cpu_usage:.0f}%</span> <span style='color: #666;'>|</span> <span style='color: #CCCCCC;'>RAM:</span> <span style='color: {ram_color};'>{mem_str}</span>"
-            self.system_metrics.setText(metrics_html)
+                metrics_html = self._build_metrics_html(status_data)
+            
+            # Só re-renderiza o rich text quando o conteúdo muda
+            if metrics_html != self.last_metrics_html:
+                self.last_metrics_html = metrics_html
+                self.system_metrics.setText(metrics_html)
             
         except RuntimeError:
             # Widget was deleted, ignore the update
             pass
 
+    def _build_metrics_html(self, status_data: Dict[str, Any]) -> str:
+        """ Monta o HTML colorido das métricas de CPU/RAM do Node. """
+        cpu_usage = status_data.get('cpu', 0.0) * 100
+        
+        mem_total = status_data.get('memory', {}).get('total', 0)
+        mem_used = status_data.get('memory', {}).get('used', 0)
+        
+        if mem_total > 0:
+            mem_percent = (mem_used / mem_total) * 100
+            mem_used_gb = mem_used / (1024**3)
+            mem_total_gb = mem_total / (1024**3)
+            mem_str = f"{mem_percent:.0f}% ({mem_used_gb:.1f}/{mem_total_gb:.1f}GB)"
+        else:
+            mem_str = "--"
+            mem_percent = 0
+
+        # Define colors based on usage
+        cpu_color = "#4CAF50" if cpu_usage < 70 else "#FF9800" if cpu_usage < 90 else "#F44336"
+        ram_color = "#4CAF50" if mem_percent < 70 else "#FF9800" if mem_percent < 90 else "#F44336"
+
+        # Compact metrics display with colors
+        return f"<span style='color: #CCCCCC;'>CPU:</span> <span style='color: {cpu_color};'>{cpu_usage:.0f}%</span> <span style='color: #666;'>|</span> <span style='color: #CCCCCC;'>RAM:</span> <span style='color: {ram_color};'>{mem_str}</span>"
+
 
     def update_vms_widgets(self, vms_list: Optional[List[Dict[str, Any]]]):
         """Updates VM tree with status count and applies filters"""
         
-        if not vms_list:
-            if hasattr(self, 'vm_counts'):
-                try:
-                    vm_text = "VMs: <span style='color: #4CAF50;'>0 online</span>, <span style='color: #F44336;'>0 offline</span>"
-                    self.vm_counts.setText(vm_text)
-                    
-                    # Set status dot to gray when no VMs
-                    if hasattr(self, 'status_dot'):
-                        self.status_dot.setStyleSheet("""
-                            QLabel {
-                                color: #666666;
-                                font-size: 10pt;
-                            }
-                        """)
-                except RuntimeError:
-                    pass
-            self.unfiltered_vms_list = []
-            self.apply_filters()
-            return
-
-        # Store unfiltered list for filter operations
-        self.unfiltered_vms_list = vms_list.copy()
-
-        # Count online and offline VMs (from unfiltered data)
+        # Store unfiltered VMs (keyed by vmid) for filter operations - uma única
+        # passada conta as online e monta o dicionário (sem cópia da lista). Os campos
+        # derivados (_running, _search_blob) já vêm do worker (index_vm)
+        vms_by_id = {}
         online_count = 0
-        offline_count = 0
-        
-        for vm in vms_list:
-            if vm.get('status') == 'running':
+        for vm in vms_list or []:
+            vms_by_id[vm.get('vmid')] = vm
+            if vm['_running']:
                 online_count += 1
-            else:
-                offline_count += 1
+        
+        self.unfiltered_vms = vms_by_id
+        self.online_count = online_count
+        self.vms_version += 1
         
         # Update VM counts in footer with colors and status dot
-        if hasattr(self, 'vm_counts'):
-            try:
-                vm_text = f"VMs: <span style='color: #4CAF50;'>{online_count} online</span>, <span style='color: #F44336;'>{offline_count} offline</span>"
-                self.vm_counts.setText(vm_text)
-                
-                # Update status dot color based on VMs status
-                if hasattr(self, 'status_dot'):
-                    if online_count > 0:
-                        dot_color = "#4CAF50"  # Green if any VMs online
-                    elif offline_count > 0:
-                        dot_color = "#F44336"  # Red if only offline VMs
-                    else:
-                        dot_color = "#666666"  # Gray if no VMs
-                    
-                    self.status_dot.setStyleSheet(f"""
-                        QLabel {{
-                            color: {dot_color};
-                            font-size: 10pt;
-                        }}
-                    """)
-            except RuntimeError:
-                pass
+        self.update_vm_counts()
         
         # Apply filters (this will update the tree)
         self.apply_filters()
@@ -559,7 +712,7 @@ class MainWindow(QMainWindow):
         title_label = QLabel("Servers")
         title_label.setFont(QFont("Arial", 18, QFont.Bold)) 
         title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet("color: #00A3CC; margin-bottom: 10px; padding: 5px;") 
+        title_label.setObjectName("headerTitle")  # Estilo na MAIN_WINDOW_STYLESHEET
         self.main_layout.addWidget(title_label)
     
     def setup_tabs(self):
@@ -574,53 +727,13 @@ class MainWindow(QMainWindow):
         self.all_vms_btn.setCheckable(True)
         self.all_vms_btn.setChecked(True)
         self.all_vms_btn.clicked.connect(lambda: self.switch_view_mode("all"))
-        self.all_vms_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #00A3CC;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 8px 20px;
-                font-size: 10pt;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #00BFFF;
-            }
-            QPushButton:checked {
-                background-color: #00A3CC;
-            }
-            QPushButton:!checked {
-                background-color: #383838;
-                color: #AAAAAA;
-            }
-        """)
+        self.all_vms_btn.setObjectName("tabAllVms")  # Estilo na MAIN_WINDOW_STYLESHEET
         
         # Botão "Active Connections" com contador integrado
         self.active_connections_btn = QPushButton("Active Connections (0)")
         self.active_connections_btn.setCheckable(True)
         self.active_connections_btn.clicked.connect(lambda: self.switch_view_mode("active"))
-        self.active_connections_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #FF6B35;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 8px 20px;
-                font-size: 10pt;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #FF8555;
-            }
-            QPushButton:checked {
-                background-color: #FF6B35;
-            }
-            QPushButton:!checked {
-                background-color: #383838;
-                color: #AAAAAA;
-            }
-        """)
+        self.active_connections_btn.setObjectName("tabActiveConnections")
         
         tabs_layout.addWidget(self.all_vms_btn)
         tabs_layout.addWidget(self.active_connections_btn)
@@ -645,6 +758,7 @@ class MainWindow(QMainWindow):
         self.setup_filters()
         
         self.tree_widget = VMTreeWidget(self.controller, self.process_manager)
+        self.tree_widget.vm_action_performed.connect(self.reset_poll_interval)
         self.tree_widget.vm_action_performed.connect(self.run_update_in_thread)
         self.tree_widget.process_registered.connect(self.on_process_registered)
         
@@ -656,23 +770,17 @@ class MainWindow(QMainWindow):
     
     def on_process_registered(self):
         """Chamado quando um processo é registrado - atualiza botões e contador"""
+        self.reset_poll_interval()
         # Atualiza apenas os botões de todas as VMs (sem fazer requisição API)
         self.tree_widget.update_all_vm_buttons()
         # Atualiza contador de conexões ativas
-        self.update_active_connections_count()
+        self.request_counters_refresh()
 
     def setup_filters(self):
         """Sets up the filter controls above the tree"""
         # Container for filters
         self.filter_container = QFrame()
-        self.filter_container.setStyleSheet("""
-            QFrame {
-                background-color: #2D2D2D;
-                border-radius: 6px;
-                margin: 5px;
-                padding: 5px;
-            }
-        """)
+        self.filter_container.setObjectName("filterContainer")  # Estilo na MAIN_WINDOW_STYLESHEET
         filter_layout = QHBoxLayout(self.filter_container)
         filter_layout.setContentsMargins(10, 8, 10, 8)
         
@@ -680,26 +788,12 @@ class MainWindow(QMainWindow):
         
         # Search field
         search_label = QLabel("🔍 Search:")
-        search_label.setStyleSheet("color: white; font-weight: bold; font-size: 10pt;")
+        search_label.setObjectName("filterLabel")
         filter_layout.addWidget(search_label)
         
         self.search_field = QLineEdit()
         self.search_field.setPlaceholderText("Type VM name to search...")
-        self.search_field.setStyleSheet("""
-            QLineEdit {
-                background-color: #383838;
-                border: 1px solid #555555;
-                border-radius: 4px;
-                padding: 6px;
-                color: white;
-                font-size: 10pt;
-                min-width: 200px;
-            }
-            QLineEdit:focus {
-                border: 1px solid #4A90E2;
-                background-color: #404040;
-            }
-        """)
+        self.search_field.setObjectName("searchField")
         self.search_field.textChanged.connect(self.on_search_changed)
         filter_layout.addWidget(self.search_field)
         
@@ -707,61 +801,18 @@ class MainWindow(QMainWindow):
         
         # Status filter
         status_label = QLabel("📊 Status:")
-        status_label.setStyleSheet("color: white; font-weight: bold; font-size: 10pt;")
+        status_label.setObjectName("filterLabel")
         filter_layout.addWidget(status_label)
         
         self.status_combo = QComboBox()
         self.status_combo.addItems(["ALL", "RUNNING", "STOPPED"])
-        self.status_combo.setStyleSheet("""
-            QComboBox {
-                background-color: #383838;
-                border: 1px solid #555555;
-                border-radius: 4px;
-                padding: 6px;
-                color: white;
-                font-size: 10pt;
-                min-width: 100px;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 20px;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 4px solid transparent;
-                border-right: 4px solid transparent;
-                border-top: 6px solid #CCCCCC;
-                margin-right: 6px;
-            }
-            QComboBox QAbstractItemView {
-                background-color: #383838;
-                border: 1px solid #555555;
-                selection-background-color: #4A90E2;
-                color: white;
-            }
-        """)
+        self.status_combo.setObjectName("statusFilter")
         self.status_combo.currentTextChanged.connect(self.on_status_filter_changed)
         filter_layout.addWidget(self.status_combo)
         
         # Clear filters button
         clear_btn = QPushButton("Clear")
-        clear_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #FF6B6B;
-                border: none;
-                border-radius: 4px;
-                padding: 6px 12px;
-                color: white;
-                font-weight: bold;
-                font-size: 10pt;
-            }
-            QPushButton:hover {
-                background-color: #FF5252;
-            }
-            QPushButton:pressed {
-                background-color: #E53935;
-            }
-        """)
+        clear_btn.setObjectName("clearFilters")
         clear_btn.clicked.connect(self.clear_filters)
         filter_layout.addWidget(clear_btn)
         
@@ -769,7 +820,8 @@ class MainWindow(QMainWindow):
         
         # Results count
         self.results_label = QLabel()
-        self.results_label.setStyleSheet("color: #888888; font-size: 9pt;")
+        self.results_label.setObjectName("filterResults")
+        self.results_label.setTextFormat(Qt.PlainText)  # Só números: sem detecção de rich text
         filter_layout.addWidget(self.results_label)
         
         self.main_layout.addWidget(self.filter_container)
@@ -781,12 +833,7 @@ class MainWindow(QMainWindow):
         """Clean and minimal footer"""
         footer_container = QWidget()
         footer_container.setFixedHeight(28)
-        footer_container.setStyleSheet("""
-            QWidget {
-                background-color: #1E1E1E;
-                border-top: 1px solid #333333;
-            }
-        """)
+        footer_container.setObjectName("footer")  # Estilo na MAIN_WINDOW_STYLESHEET
         
         footer_layout = QHBoxLayout(footer_container)
         footer_layout.setContentsMargins(16, 4, 16, 4)
@@ -800,22 +847,15 @@ class MainWindow(QMainWindow):
         
         # Status dot (will change color based on VMs status)
         self.status_dot = QLabel("●")
-        self.status_dot.setStyleSheet("""
-            QLabel {
-                color: #666666;
-                font-size: 10pt;
-            }
-        """)
+        self.status_dot.setTextFormat(Qt.PlainText)  # Só o glifo: sem detecção de rich text
+        self.status_dot.setObjectName("statusDot")
+        self.status_dot.setProperty("state", "empty")
+        self.last_dot_state = "empty"
         
         # VM counts
         self.vm_counts = QLabel("VMs: 0 online, 0 offline")
-        self.vm_counts.setStyleSheet("""
-            QLabel {
-                color: #888888;
-                font-size: 8pt;
-                margin-left: 8px;
-            }
-        """)
+        self.vm_counts.setObjectName("footerVmCounts")
+        self.vm_counts.setTextFormat(Qt.RichText)  # Spans coloridos: evita a auto-detecção a cada setText
         
         status_layout.addWidget(self.status_dot)
         status_layout.addWidget(self.vm_counts)
@@ -825,31 +865,32 @@ class MainWindow(QMainWindow):
         
         # Center: System metrics (compact)
         self.system_metrics = QLabel("CPU: -- | RAM: --")
-        self.system_metrics.setStyleSheet("""
-            QLabel {
-                color: #999999;
-                font-size: 8pt;
-                font-family: 'Segoe UI', 'Consolas', monospace;
-            }
-        """)
+        self.system_metrics.setObjectName("footerMetrics")
+        self.system_metrics.setTextFormat(Qt.RichText)
         
         footer_layout.addWidget(self.system_metrics)
         footer_layout.addStretch()
         
         # Right side: Copyright
-        current_year = datetime.datetime.now().year
-        copyright_text = f"© {current_year} <a href='https://github.com/pauloswear/proxmanager' style='color: #00A3CC; text-decoration: none;'>Paulo Henrique</a>"
-        copyright_label = QLabel(copyright_text)
-        copyright_label.setStyleSheet("""
-            QLabel {
-                color: #666666;
-                font-size: 8pt;
-            }
-        """)
+        copyright_label = QLabel(COPYRIGHT_HTML)
+        copyright_label.setObjectName("footerCopyright")
+        copyright_label.setTextFormat(Qt.RichText)
         copyright_label.setOpenExternalLinks(True)
+        copyright_label.setTextInteractionFlags(Qt.LinksAccessibleByMouse)
+        # Cor do link pela paleta (lookup direto) em vez de CSS inline no <a>
+        link_palette = copyright_label.palette()
+        link_palette.setColor(QPalette.Link, QColor("#00A3CC"))
+        copyright_label.setPalette(link_palette)
         
         footer_layout.addWidget(copyright_label)
         self.main_layout.addWidget(footer_container)
+        
+        # Larguras reservadas para os textos atualizados a cada tick: se a largura do
+        # label mudasse, os stretches recentralizariam os vizinhos e o footer inteiro
+        # seria relayoutado/repintado. Depois do addWidget para já ter a fonte da stylesheet.
+        self._reserve_label_width(self.vm_counts, "VMs: 9999 online, 9999 offline")
+        self._reserve_label_width(self.system_metrics, "CPU: 100% | RAM: 100% (9999.9/9999.9GB)")
+        self.system_metrics.setAlignment(Qt.AlignCenter)
 
 
 
@@ -857,10 +898,40 @@ class MainWindow(QMainWindow):
     # --- Utility Methods
     # --------------------------------------------------------------------------
 
+    @staticmethod
+    def _network_refresh_interval(configs: Dict[str, Any]) -> float:
+        """Reads "network_refresh_interval" from configs.json (falls back to the client default)"""
+        value = configs.get('network_refresh_interval')
+        if value is None:
+            return ProxmoxAPIClient.VM_NETWORK_TTL
+        try:
+            interval = float(value)
+        except (ValueError, TypeError):
+            logger.warning("Invalid network_refresh_interval %r, using %.0fs",
+                           value, ProxmoxAPIClient.VM_NETWORK_TTL)
+            return ProxmoxAPIClient.VM_NETWORK_TTL
+        # nan/negativos/zero viram o mínimo: o guest agent não deve ser consultado a cada tick
+        if not interval >= MIN_NETWORK_REFRESH_INTERVAL:
+            return MIN_NETWORK_REFRESH_INTERVAL
+        return interval
+
+    @staticmethod
+    def _reserve_label_width(label: QLabel, sample_text: str):
+        """Sets the label minimum width to fit the widest expected text"""
+        label.ensurePolished()
+        label.setMinimumWidth(label.fontMetrics().horizontalAdvance(sample_text))
+
     def load_geometry(self):
         configs = self.config_manager.load_configs()
         window_config = configs.get('window', {})
         
+        # Geometria nativa do Qt (posição, tela e estado maximizado de uma vez)
+        geometry = window_config.get('geometry')
+        if geometry and self.restoreGeometry(QByteArray.fromBase64(geometry.encode('ascii'))):
+            self.saved_window_state = geometry
+            return
+        
+        # Legado: configs salvas antes da geometria nativa (width/height/maximized)
         # Set size from saved config or defaults
         width = window_config.get('width', 1200)
         height = window_config.get('height', 800)
@@ -874,251 +945,162 @@ class MainWindow(QMainWindow):
             self.showMaximized()
             
     def closeEvent(self, event):
-        # Save window configuration
+        # Stop polling - workers still in flight must not rearm the timer
+        self.updates_paused = True
+        self.timer.stop()
+        self.cancel_workers()
+        
+        # Save window geometry (only if it changed since load_geometry)
         try:
-            configs = self.config_manager.load_configs()
-            
-            # Save only size and maximized state
-            configs['window'] = {
-                'width': self.size().width(),
-                'height': self.size().height(),
-                'maximized': self.isMaximized()
-            }
-            
-            self.config_manager.save_configs(configs)
+            geometry = bytes(self.saveGeometry().toBase64()).decode('ascii')
+            if geometry != self.saved_window_state:
+                self.config_manager.update_section('window', {'geometry': geometry})
+                self.saved_window_state = geometry
         except Exception as e:
             pass  # Silently ignore config save errors
         
         event.accept()
 
     def center(self): 
+        # Centro da tela principal consultado uma vez (sem construir um QDesktopWidget)
+        if self.screen_center is None:
+            self.screen_center = QGuiApplication.primaryScreen().availableGeometry().center()
         qr = self.frameGeometry()
-        cp = QDesktopWidget().availableGeometry().center()
-        qr.moveCenter(cp)
+        qr.moveCenter(self.screen_center)
         self.move(qr.topLeft())
 
     def setup_sidebar(self):
         """Creates a compact sidebar with icon-only buttons"""
         self.sidebar = QWidget()
         self.sidebar.setFixedWidth(60)
-        self.sidebar.setStyleSheet("""
-            QWidget {
-                background-color: #2D2D2D;
-                border-right: 1px solid #404040;
-            }
-        """)
+        # Uma única stylesheet para a sidebar inteira; os botões são selecionados pelo objectName
+        self.sidebar.setStyleSheet(SIDEBAR_STYLESHEET)
         
         sidebar_layout = QVBoxLayout(self.sidebar)
         sidebar_layout.setContentsMargins(5, 8, 5, 8)
         sidebar_layout.setSpacing(6)
         
-        # Logo icon
-        logo_btn = QPushButton("🚀")
-        logo_btn.setStyleSheet(self._get_sidebar_icon_style(logo=True))
-        logo_btn.setEnabled(False)
-        logo_btn.setToolTip("ProxManager")
-        sidebar_layout.addWidget(logo_btn)
-        
-        # Separator
-        separator = QFrame()
-        separator.setFrameStyle(QFrame.HLine)
-        separator.setStyleSheet("color: #404040; margin: 5px 0;")
-        sidebar_layout.addWidget(separator)
-        
-        # Dashboard button (current page)
-        dashboard_btn = QPushButton("🏠")
-        dashboard_btn.setStyleSheet(self._get_sidebar_icon_style(active=True))
-        dashboard_btn.setEnabled(False)
-        dashboard_btn.setToolTip("Dashboard")
-        sidebar_layout.addWidget(dashboard_btn)
-        
-        # Search toggle button (starts inactive since menu is collapsed by default)
-        self.search_sidebar_btn = QPushButton("🔍")
-        self.search_sidebar_btn.setStyleSheet(self._get_sidebar_icon_style())
-        self.search_sidebar_btn.setToolTip("Toggle Search Menu")
-        self.search_sidebar_btn.clicked.connect(self.toggle_search_menu)
-        sidebar_layout.addWidget(self.search_sidebar_btn)
-        
-        # Connect All SPICE button
-        self.connect_all_spice_btn = QPushButton("🖥️")
-        self.connect_all_spice_btn.setStyleSheet(self._get_sidebar_icon_style())
-        self.connect_all_spice_btn.setToolTip("Connect All SPICE VMs (Background)")
-        self.connect_all_spice_btn.clicked.connect(self.connect_all_spice_vms)
-        sidebar_layout.addWidget(self.connect_all_spice_btn)
-        
-        # Add spacer
-        sidebar_layout.addStretch()
-        
-        # Settings button
-        self.settings_btn = QPushButton("⚙️")
-        self.settings_btn.setStyleSheet(self._get_sidebar_icon_style())
-        self.settings_btn.clicked.connect(self.show_settings)
-        self.settings_btn.setToolTip("Configurations")
-        sidebar_layout.addWidget(self.settings_btn)
-        
-        # Node Restart button
-        self.node_restart_btn = QPushButton("♻️")
-        self.node_restart_btn.setStyleSheet(self._get_sidebar_icon_style(warning=True))
-        self.node_restart_btn.clicked.connect(self.on_node_restart_clicked)
-        self.node_restart_btn.setToolTip("Restart Node")
-        sidebar_layout.addWidget(self.node_restart_btn)
-        
-        # Node Shutdown button
-        self.node_shutdown_btn = QPushButton("🛑")
-        self.node_shutdown_btn.setStyleSheet(self._get_sidebar_icon_style(danger=True))
-        self.node_shutdown_btn.clicked.connect(self.on_node_shutdown_clicked)
-        self.node_shutdown_btn.setToolTip("Shutdown Node")
-        sidebar_layout.addWidget(self.node_shutdown_btn)
-        
-        # Logout button
-        self.logout_btn = QPushButton("🚪")
-        self.logout_btn.setStyleSheet(self._get_sidebar_icon_style(logout=True))
-        self.logout_btn.clicked.connect(self.logout)
-        self.logout_btn.setToolTip("Logout")
-        sidebar_layout.addWidget(self.logout_btn)
+        # (atributo, ícone, variante, tooltip, handler) - "separator"/"stretch" marcam
+        # a posição do separador e do espaçador. Botões sem handler ficam desabilitados.
+        sidebar_spec = (
+            (None, "🚀", "logo", "ProxManager", None),
+            "separator",
+            # Dashboard (página atual)
+            (None, "🏠", "active", "Dashboard", None),
+            # Busca começa inativa (menu recolhido por padrão)
+            ("search_sidebar_btn", "🔍", "default", "Toggle Search Menu", self.toggle_search_menu),
+            ("connect_all_spice_btn", "🖥️", "default", "Connect All SPICE VMs (Background)", self.connect_all_spice_vms),
+            "stretch",
+            ("settings_btn", "⚙️", "default", "Configurations", self.show_settings),
+            ("node_restart_btn", "♻️", "warning", "Restart Node", self.on_node_restart_clicked),
+            ("node_shutdown_btn", "🛑", "danger", "Shutdown Node", self.on_node_shutdown_clicked),
+            ("logout_btn", "🚪", "logout", "Logout", self.logout),
+        )
+        
+        for item in sidebar_spec:
+            if item == "separator":
+                separator = QFrame()
+                separator.setFrameStyle(QFrame.HLine)
+                separator.setObjectName("sidebarSeparator")  # Estilo na SIDEBAR_STYLESHEET
+                sidebar_layout.addWidget(separator)
+                continue
+            if item == "stretch":
+                sidebar_layout.addStretch()
+                continue
+            
+            attr_name, icon, variant, tooltip, handler = item
+            btn = self._make_sidebar_button(icon, variant, tooltip, handler)
+            sidebar_layout.addWidget(btn)
+            if attr_name is not None:
+                setattr(self, attr_name, btn)
 
-    def _get_sidebar_icon_style(self, active=False, logout=False, logo=False, warning=False, danger=False):
-        """Returns the stylesheet for sidebar icon buttons"""
-        if logo:
-            return """
-                QPushButton {
-                    background-color: transparent;
-                    color: #00A3CC;
-                    border: none;
-                    padding: 6px;
-                    text-align: center;
-                    border-radius: 6px;
-                    font-size: 16px;
-                    font-weight: bold;
-                    min-width: 32px;
-                    min-height: 32px;
-                }
-            """
-        elif active:
-            return """
-                QPushButton {
-                    background-color: #00A3CC;
-                    color: white;
-                    border: none;
-                    padding: 6px;
-                    text-align: center;
-                    border-radius: 6px;
-                    font-size: 14px;
-                    font-weight: bold;
-                    min-width: 32px;
-                    min-height: 32px;
-                }
-            """
-        elif logout:
-            return """
-                QPushButton {
-                    background-color: transparent;
-                    color: #DC3545;
-                    border: 1px solid #DC3545;
-                    padding: 6px;
-                    text-align: center;
-                    border-radius: 6px;
-                    font-size: 14px;
-                    min-width: 32px;
-                    min-height: 32px;
-                }
-                QPushButton:hover {
-                    background-color: #DC3545;
-                    color: white;
-                }
-                QPushButton:pressed {
-                    background-color: #B52D37;
-                }
-            """
-        elif warning:
-            return """
-                QPushButton {
-                    background-color: transparent;
-                    color: #FFC107;
-                    border: none;
-                    padding: 6px;
-                    text-align: center;
-                    border-radius: 6px;
-                    font-size: 14px;
-                    min-width: 32px;
-                    min-height: 32px;
-                }
-                QPushButton:hover {
-                    background-color: #555555;
-                }
-                QPushButton:pressed {
-                    background-color: #444444;
-                }
-            """
-        elif danger:
-            return """
-                QPushButton {
-                    background-color: transparent;
-                    color: #DC3545;
-                    border: none;
-                    padding: 6px;
-                    text-align: center;
-                    border-radius: 6px;
-                    font-size: 14px;
-                    min-width: 32px;
-                    min-height: 32px;
-                }
-                QPushButton:hover {
-                    background-color: #555555;
-                }
-                QPushButton:pressed {
-                    background-color: #444444;
-                }
-            """
+    @staticmethod
+    def _make_sidebar_button(icon: str, variant: str, tooltip: str, handler=None) -> QPushButton:
+        """Creates a sidebar icon button; the look comes from SIDEBAR_STYLESHEET via objectName"""
+        btn = QPushButton(icon)
+        if variant == "active":
+            btn.setObjectName(SIDEBAR_OBJECT_NAMES["default"])
+            btn.setProperty("active", True)
+        else:
+            btn.setObjectName(SIDEBAR_OBJECT_NAMES[variant])
+        btn.setToolTip(tooltip)
+        if handler is not None:
+            btn.clicked.connect(handler)
         else:
-            return """
-                QPushButton {
-                    background-color: transparent;
-                    color: #CCCCCC;
-                    border: none;
-                    padding: 6px;
-                    text-align: center;
-                    border-radius: 6px;
-                    font-size: 14px;
-                    min-width: 32px;
-                    min-height: 32px;
-                }
-                QPushButton:hover {
-                    background-color: #404040;
-                    color: white;
-                }
-                QPushButton:pressed {
-                    background-color: #505050;
-                }
-            """
+            btn.setEnabled(False)  # Botões informativos (logo, página atual)
+        return btn
+
+    @staticmethod
+    def _set_sidebar_button_active(button: QPushButton, active: bool):
+        """Toggles the highlighted state of a sidebar icon button (re-polishes its style)"""
+        set_style_property(button, "active", active)
 
     # --------------------------------------------------------------------------
     # --- Métodos de Controle do Node
     # --------------------------------------------------------------------------
     
     def on_node_restart_clicked(self):
+        if self.action_busy:
+            return  # Confirmação aberta ou comando de node ainda em andamento
+        self.action_busy = True
+        
         reply = QMessageBox.question(self, 'Confirmação de Restart',
             "Tem certeza que deseja REINICIAR o Node?\nIsso afetará todas as VMs!",
             QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            success = self.controller.api_client.restart_node()
-            if success:
-                QMessageBox.information(self, "Restart Iniciado", "Comando de restart enviado. O Node ficará inacessível.", QMessageBox.Ok)
-            else:
-                QMessageBox.critical(self, "Erro de API", "ERRO ao tentar reiniciar o Node.", QMessageBox.Ok)
+            self.run_node_command(
+                self.controller.api_client.restart_node,
+                ("Restart Iniciado", "Comando de restart enviado. O Node ficará inacessível."),
+                "ERRO ao tentar reiniciar o Node.")
+        else:
+            self.action_busy = False
             
     def on_node_shutdown_clicked(self):
+        if self.action_busy:
+            return  # Confirmação aberta ou comando de node ainda em andamento
+        self.action_busy = True
+        
         reply = QMessageBox.question(self, 'Confirmação de Shutdown',
             "Tem certeza que deseja DESLIGAR o Node?\nIsso afetará todas as VMs!",
             QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         
         if reply == QMessageBox.Yes:
-            success = self.controller.api_client.shutdown_node()
-            if success:
-                QMessageBox.information(self, "Shutdown Iniciado", "Comando de shutdown enviado. O Node será desligado.", QMessageBox.Ok)
-            else:
-                QMessageBox.critical(self, "Erro de API", "ERRO ao tentar desligar o Node.", QMessageBox.Ok)
+            self.run_node_command(
+                self.controller.api_client.shutdown_node,
+                ("Shutdown Iniciado", "Comando de shutdown enviado. O Node será desligado."),
+                "ERRO ao tentar desligar o Node.")
+        else:
+            self.action_busy = False
+
+    def run_node_command(self, command, success_message: Tuple[str, str], error_text: str):
+        """Sends a node command in the thread pool; the buttons stay disabled until it answers"""
+        self.node_restart_btn.setEnabled(False)
+        self.node_shutdown_btn.setEnabled(False)
+        self.pending_node_messages = (success_message, error_text)
+        
+        worker = Worker(command)
+        worker.signals.result.connect(self.handle_node_command_result)
+        worker.signals.error.connect(self.handle_node_command_error)
+        self.threadpool.start(worker)
+    
+    @pyqtSlot(object)
+    def handle_node_command_result(self, success):
+        """Reports the node command outcome and re-enables the node buttons"""
+        self.node_restart_btn.setEnabled(True)
+        self.node_shutdown_btn.setEnabled(True)
+        self.action_busy = False
+        (success_title, success_text), error_text = self.pending_node_messages
+        
+        if success:
+            QMessageBox.information(self, success_title, success_text, QMessageBox.Ok)
+        else:
+            QMessageBox.critical(self, "Erro de API", error_text, QMessageBox.Ok)
+    
+    @pyqtSlot(tuple)
+    def handle_node_command_error(self, error):
+        """Unexpected exception in the node command - reported as a failure"""
+        self.handle_node_command_result(False)
 
     # --------------------------------------------------------------------------
     # --- Métodos do Sidebar
@@ -1126,62 +1108,82 @@ class MainWindow(QMainWindow):
     
     def connect_all_spice_vms(self):
         """Connect to all VMs that support SPICE in background"""
-        if not hasattr(self, 'unfiltered_vms_list') or not self.unfiltered_vms_list:
+        if not self.unfiltered_vms or self.spice_connect_running:
             return
         
-        # Filter VMs that support SPICE (have QXL display) and are running
-        spice_vms = []
-        for vm in self.unfiltered_vms_list:
-            if vm.get('status') != 'running':
-                continue
-            
-            vmid = vm.get('vmid')
-            vm_type = vm.get('type')
-            
-            # Check if VM has SPICE support (QXL display)
-            vm_config = self.controller.api_client.get_vm_config(vmid, vm_type)
-            if vm_config and 'vga' in vm_config:
-                vga_type = vm_config.get('vga', '').lower()
-                if 'qxl' in vga_type:
-                    spice_vms.append(vm)
-        
+        # Running VMs with SPICE support (QXL display) and no open connection (any protocol).
+        # O vga já vem no dicionário da VM (fetch_vm_details): sem chamada à API aqui. Ele sai
+        # da config cacheada, então pode ter até VM_CONFIG_TTL (5 min) de idade: uma VM cujo
+        # display acabou de ser trocado de/para QXL fora do app ainda pode ser escolhida ou
+        # ignorada por esse tempo (start/stop/reboot pelo app invalidam a config na hora)
+        spice_vms = [
+            vm for vm in self.unfiltered_vms.values()
+            if vm.get('status') == 'running'
+            and 'qxl' in vm.get('vga', '').lower()
+            and not self.process_manager.has_active_process(vm.get('vmid'))
+        ]
         if not spice_vms:
             return
         
-        # Connect to all SPICE VMs without confirmation
+        # Connect to all SPICE VMs without confirmation - fora da thread da GUI
+        self.spice_connect_running = True
+        self.connect_all_spice_btn.setEnabled(False)
+        worker = Worker(self.start_spice_viewers, spice_vms)
+        worker.signals.result.connect(self.handle_spice_connect_result)
+        worker.signals.finished.connect(self.handle_spice_connect_finished)
+        self.threadpool.start(worker)
+    
+    def start_spice_viewers(self, spice_vms: List[Dict[str, Any]]) -> List[Tuple[Any, Optional[int]]]:
+        """Starts the viewers in parallel (runs in a Worker); returns (vmid, pid or None) per VM"""
+        with ThreadPoolExecutor(max_workers=self.SPICE_CONNECT_WORKERS) as executor:
+            pids = list(executor.map(self._start_background_spice, spice_vms))
+        return [(vm.get('vmid'), pid) for vm, pid in zip(spice_vms, pids)]
+    
+    @pyqtSlot(object)
+    def handle_spice_connect_result(self, results):
+        """Registers the started viewers (GUI thread) and refreshes the buttons once"""
         connected = 0
-        failed = 0
+        for vmid, pid in results:
+            if pid:
+                self.process_manager.register_process(vmid, pid, 'spice')
+                connected += 1
+        logger.info("SPICE connect all: %d connected, %d failed", connected, len(results) - connected)
         
-        for vm in spice_vms:
-            vmid = vm.get('vmid')
-            vm_name = vm.get('name', f'VM {vmid}')
-            
-            # Check if already connected (any protocol)
-            if self.process_manager.has_active_process(vmid):
-                print(f"VM {vmid} ({vm_name}) already has an active connection, skipping...")
-                continue
-            
-            try:
-                # Start SPICE connection in background
-                pid = self.controller.start_viewer(vmid, protocol='spice', background=True)
-                if pid:
-                    # Register the process
-                    self.process_manager.register_process(vmid, pid, 'spice')
-                    connected += 1
-                    print(f"Connected to VM {vmid} ({vm_name}) via SPICE (PID: {pid})")
-                else:
-                    failed += 1
-                    print(f"Failed to connect to VM {vmid} ({vm_name})")
-            except Exception as e:
-                failed += 1
-                print(f"Error connecting to VM {vmid} ({vm_name}): {e}")
-        
-        # Update UI to reflect new connections
-        if hasattr(self, 'vm_tree'):
-            self.vm_tree.update_all_vm_buttons()
+        # Update UI to reflect new connections (uma única vez, depois de todas)
+        self.tree_widget.update_all_vm_buttons()
+        self.request_counters_refresh()
+    
+    @pyqtSlot()
+    def handle_spice_connect_finished(self):
+        """Re-enables the Connect All button (also after an unexpected error)"""
+        self.spice_connect_running = False
+        try:
+            self.connect_all_spice_btn.setEnabled(True)
+        except RuntimeError:
+            # Janela já destruída
+            pass
+    
+    def _start_background_spice(self, vm: Dict[str, Any]) -> Optional[int]:
+        """Starts a background SPICE viewer for the VM; returns the PID or None (runs in a pool thread)"""
+        vmid = vm.get('vmid')
+        vm_name = vm.get('name', f'VM {vmid}')
+        try:
+            pid = self.controller.start_viewer(vmid, protocol='spice', background=True)
+        except Exception as e:
+            logger.warning("Error connecting to VM %s (%s): %s", vmid, vm_name, e)
+            return None
+        if pid:
+            logger.info("Connected to VM %s (%s) via SPICE (PID: %s)", vmid, vm_name, pid)
+        else:
+            logger.warning("Failed to connect to VM %s (%s)", vmid, vm_name)
+        return pid
 
     def logout(self):
         """Logout and return to login window"""
+        if self.action_busy:
+            return
+        self.action_busy = True
+        
         reply = QMessageBox.question(
             self, "Logout", 
             "Tem certeza que deseja fazer logout?",
@@ -1189,10 +1191,11 @@ class MainWindow(QMainWindow):
             QMessageBox.No
         )
         
-        if reply == QMessageBox.Yes:
+        if reply != QMessageBox.Yes:
+            self.action_busy = False
+        else:
             # Stop the timer
-            if hasattr(self, 'timer') and self.timer:
-                self.timer.stop()
+            self.timer.stop()
             
             # Clear any stored credentials if auto_login is disabled
             login_data = self.config_manager.load_login_data()
@@ -1203,97 +1206,56 @@ class MainWindow(QMainWindow):
             # Close this window and show login
             self.close()
             
-            # Import and show login window
+            # Import local: login_window importa este módulo (import circular).
+            # O módulo já está em sys.modules (o app começa pelo login), então é só um lookup
             from .login_window import LoginWindow
             self.login_window = LoginWindow()
             self.login_window.show()
 
-    def show_settings(self):
-        """Show settings dialog"""
-        from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QGroupBox, QCheckBox, 
-                                   QDialogButtonBox, QFormLayout, QSpinBox, QLabel)
-        
+    def _build_settings_dialog(self):
+        """Builds the settings dialog once; show_settings only refreshes its values"""
         dialog = QDialog(self)
         dialog.setWindowTitle("Configurations")
         dialog.setFixedSize(350, 200)
-        dialog.setStyleSheet("""
-            QDialog {
-                background-color: #2D2D2D;
-                color: white;
-            }
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #555555;
-                border-radius: 5px;
-                margin-top: 5px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-                color: #CCCCCC;
-            }
-            QCheckBox {
-                color: #CCCCCC;
-                spacing: 5px;
-            }
-            QCheckBox::indicator {
-                width: 15px;
-                height: 15px;
-            }
-            QCheckBox::indicator:unchecked {
-                border: 1px solid #555555;
-                background-color: #383838;
-                border-radius: 3px;
-            }
-            QCheckBox::indicator:checked {
-                border: 1px solid #00A3CC;
-                background-color: #00A3CC;
-                border-radius: 3px;
-            }
-        """)
+        dialog.setObjectName("settingsDialog")  # Estilo na MAIN_WINDOW_STYLESHEET
         
         layout = QVBoxLayout(dialog)
         
-        # Load current configurations
-        configs = self.config_manager.load_configs()
-        
         # SPICE GroupBox
         spice_group = QGroupBox("SPICE")
-        spice_layout = QFormLayout(spice_group)
+        # Grid simples (label, campo): o diálogo tem tamanho fixo, o QFormLayout não agrega nada
+        spice_layout = QGridLayout(spice_group)
         
         # Start fullscreen checkbox
         self.fullscreen_check = QCheckBox()
-        self.fullscreen_check.setChecked(configs.get('spice_fullscreen', False))
-        spice_layout.addRow("Start fullscreen:", self.fullscreen_check)
+        spice_layout.addWidget(QLabel("Start fullscreen:"), 0, 0)
+        spice_layout.addWidget(self.fullscreen_check, 0, 1)
         
         # Auto resize checkbox
         self.autoresize_check = QCheckBox()
-        self.autoresize_check.setChecked(configs.get('spice_autoresize', False))
-        spice_layout.addRow("Auto resize:", self.autoresize_check)
+        spice_layout.addWidget(QLabel("Auto resize:"), 1, 0)
+        spice_layout.addWidget(self.autoresize_check, 1, 1)
         
         # Kiosk mode checkbox
         self.kiosk_check = QCheckBox()
-        self.kiosk_check.setChecked(configs.get('spice_kiosk', False))
-        spice_layout.addRow("Kiosk mode:", self.kiosk_check)
+        spice_layout.addWidget(QLabel("Kiosk mode:"), 2, 0)
+        spice_layout.addWidget(self.kiosk_check, 2, 1)
         
         # SmartCard checkbox
         self.smartcard_check = QCheckBox()
-        self.smartcard_check.setChecked(configs.get('spice_smartcard', True))
-        spice_layout.addRow("SmartCard:", self.smartcard_check)
+        spice_layout.addWidget(QLabel("SmartCard:"), 3, 0)
+        spice_layout.addWidget(self.smartcard_check, 3, 1)
         
         # USB Redirect checkbox
         self.usbredirect_check = QCheckBox()
-        self.usbredirect_check.setChecked(configs.get('spice_usbredirect', True))
-        spice_layout.addRow("USB Redirect:", self.usbredirect_check)
+        spice_layout.addWidget(QLabel("USB Redirect:"), 4, 0)
+        spice_layout.addWidget(self.usbredirect_check, 4, 1)
         
         # Fluidity mode combo box
         self.fluidity_combo = QComboBox()
         self.fluidity_combo.addItems(["balanced", "performance", "quality"])
-        current_fluidity = configs.get('spice_fluidity_mode', 'balanced')
-        self.fluidity_combo.setCurrentText(current_fluidity)
-        spice_layout.addRow("Fluidity:", self.fluidity_combo)
+        spice_layout.addWidget(QLabel("Fluidity:"), 5, 0)
+        spice_layout.addWidget(self.fluidity_combo, 5, 1)
         
 
         layout.addWidget(spice_group)
@@ -1303,24 +1265,28 @@ class MainWindow(QMainWindow):
             QDialogButtonBox.Ok | QDialogButtonBox.Cancel,
             Qt.Horizontal, dialog
         )
-        buttons.setStyleSheet("""
-            QPushButton {
-                background-color: #404040;
-                color: white;
-                border: 1px solid #555555;
-                padding: 8px 15px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #505050;
-            }
-        """)
         layout.addWidget(buttons)
         
         buttons.accepted.connect(dialog.accept)
         buttons.rejected.connect(dialog.reject)
         
-        if dialog.exec_() == QDialog.Accepted:
+        self.settings_dialog = dialog
+
+    def show_settings(self):
+        """Show settings dialog"""
+        if self.settings_dialog is None:
+            self._build_settings_dialog()
+        
+        # Load current configurations
+        configs = self.config_manager.load_configs()
+        self.fullscreen_check.setChecked(configs.get('spice_fullscreen', False))
+        self.autoresize_check.setChecked(configs.get('spice_autoresize', False))
+        self.kiosk_check.setChecked(configs.get('spice_kiosk', False))
+        self.smartcard_check.setChecked(configs.get('spice_smartcard', True))
+        self.usbredirect_check.setChecked(configs.get('spice_usbredirect', True))
+        self.fluidity_combo.setCurrentText(configs.get('spice_fluidity_mode', 'balanced'))
+        
+        if self.settings_dialog.exec_() == QDialog.Accepted:
             # Save SPICE settings
             configs['spice_fullscreen'] = self.fullscreen_check.isChecked()
             configs['spice_autoresize'] = self.autoresize_check.isChecked()
@@ -0,0 +1,374 @@
+# styles.py - Estilos compartilhados da aplicação
+
+from PyQt5.QtWidgets import QProxyStyle, QStyle
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QColor, QPainter, QPen
+
+
+class DarkProxyStyle(QProxyStyle):
+    """
+    Application style that paints the dark checkbox indicator natively.
+
+    Replaces the per-widget ``QCheckBox::indicator`` QSS rules: every checkbox
+    shares the same colors, so there is nothing to resolve per widget.
+    """
+
+    INDICATOR_SIZE = 15
+    INDICATOR_RADIUS = 3
+
+    UNCHECKED_BORDER = QColor("#555555")
+    UNCHECKED_FILL = QColor("#383838")
+    CHECKED_COLOR = QColor("#00A3CC")
+
+    def pixelMetric(self, metric, option=None, widget=None):
+        if metric in (QStyle.PM_IndicatorWidth, QStyle.PM_IndicatorHeight):
+            return self.INDICATOR_SIZE
+        return super().pixelMetric(metric, option, widget)
+
+    def drawPrimitive(self, element, option, painter, widget=None):
+        if element != QStyle.PE_IndicatorCheckBox:
+            super().drawPrimitive(element, option, painter, widget)
+            return
+
+        if option.state & QStyle.State_On:
+            border, fill = self.CHECKED_COLOR, self.CHECKED_COLOR
+        else:
+            border, fill = self.UNCHECKED_BORDER, self.UNCHECKED_FILL
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(border, 1))
+        painter.setBrush(fill)
+        rect = QRectF(option.rect).adjusted(0.5, 0.5, -0.5, -0.5)
+        painter.drawRoundedRect(rect, self.INDICATOR_RADIUS, self.INDICATOR_RADIUS)
+        painter.restore()
+
+
+# Stylesheets dos botões de ícone da sidebar, por variante (montados uma única vez)
+SIDEBAR_ICON_STYLES = {
+    "logo": """
+        QPushButton {
+            background-color: transparent;
+            color: #00A3CC;
+            border: none;
+            padding: 6px;
+            text-align: center;
+            border-radius: 6px;
+            font-size: 16px;
+            font-weight: bold;
+            min-width: 32px;
+            min-height: 32px;
+        }
+    """,
+    "active": """
+        QPushButton {
+            background-color: #00A3CC;
+            color: white;
+            border: none;
+            padding: 6px;
+            text-align: center;
+            border-radius: 6px;
+            font-size: 14px;
+            font-weight: bold;
+            min-width: 32px;
+            min-height: 32px;
+        }
+    """,
+    "logout": """
+        QPushButton {
+            background-color: transparent;
+            color: #DC3545;
+            border: 1px solid #DC3545;
+            padding: 6px;
+            text-align: center;
+            border-radius: 6px;
+            font-size: 14px;
+            min-width: 32px;
+            min-height: 32px;
+        }
+        QPushButton:hover {
+            background-color: #DC3545;
+            color: white;
+        }
+        QPushButton:pressed {
+            background-color: #B52D37;
+        }
+    """,
+    "warning": """
+        QPushButton {
+            background-color: transparent;
+            color: #FFC107;
+            border: none;
+            padding: 6px;
+            text-align: center;
+            border-radius: 6px;
+            font-size: 14px;
+            min-width: 32px;
+            min-height: 32px;
+        }
+        QPushButton:hover {
+            background-color: #555555;
+        }
+        QPushButton:pressed {
+            background-color: #444444;
+        }
+    """,
+    "danger": """
+        QPushButton {
+            background-color: transparent;
+            color: #DC3545;
+            border: none;
+            padding: 6px;
+            text-align: center;
+            border-radius: 6px;
+            font-size: 14px;
+            min-width: 32px;
+            min-height: 32px;
+        }
+        QPushButton:hover {
+            background-color: #555555;
+        }
+        QPushButton:pressed {
+            background-color: #444444;
+        }
+    """,
+    "default": """
+        QPushButton {
+            background-color: transparent;
+            color: #CCCCCC;
+            border: none;
+            padding: 6px;
+            text-align: center;
+            border-radius: 6px;
+            font-size: 14px;
+            min-width: 32px;
+            min-height: 32px;
+        }
+        QPushButton:hover {
+            background-color: #404040;
+            color: white;
+        }
+        QPushButton:pressed {
+            background-color: #505050;
+        }
+    """,
+}
+
+# Objeto (setObjectName) de cada variante dentro da sidebar; "active" é o botão
+# padrão com a propriedade dinâmica active=true (ex: busca aberta)
+SIDEBAR_OBJECT_NAMES = {
+    "logo": "sidebarLogo",
+    "default": "sidebarIcon",
+    "warning": "sidebarWarning",
+    "danger": "sidebarDanger",
+    "logout": "sidebarLogout",
+}
+
+SIDEBAR_STYLESHEET = "".join([
+    """
+    QWidget {
+        background-color: #2D2D2D;
+        border-right: 1px solid #404040;
+    }
+    """,
+    *(SIDEBAR_ICON_STYLES[variant].replace("QPushButton", f"QPushButton#{name}")
+      for variant, name in SIDEBAR_OBJECT_NAMES.items()),
+    # Depois do "default" para vencer o :hover/:pressed de mesma especificidade
+    SIDEBAR_ICON_STYLES["active"].replace("QPushButton", 'QPushButton#sidebarIcon[active="true"]'),
+    """
+    QFrame#sidebarSeparator {
+        color: #404040;
+        margin: 5px 0;
+    }
+    """,
+])
+
+# Stylesheet da MainWindow, aplicada uma única vez na janela. Além do tema base
+# ("*"), traz as regras estáticas do header, das abas, da barra de filtros, do footer e
+# do diálogo de configurações escopadas por objectName, então esses widgets não
+# carregam stylesheets próprias. Os containers que antes estilizavam os filhos por
+# tipo (QFrame/QWidget) mantêm a regra descendente equivalente. Variações
+# dinâmicas usam propriedades (ex: QLabel#statusDot[state="online"]) aplicadas com
+# set_style_property. Fica na janela e não no QApplication porque a regra "*" de um
+# ancestral sempre vence a stylesheet global, independentemente da especificidade.
+MAIN_WINDOW_STYLESHEET = """
+    * {
+        background-color: #1E1E1E;
+        color: white;
+    }
+
+    QDialog#settingsDialog {
+        background-color: #2D2D2D;
+        color: white;
+    }
+    QDialog#settingsDialog QGroupBox {
+        font-weight: bold;
+        border: 2px solid #555555;
+        border-radius: 5px;
+        margin-top: 5px;
+        padding-top: 10px;
+    }
+    QDialog#settingsDialog QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px 0 5px;
+        color: #CCCCCC;
+    }
+    QDialog#settingsDialog QCheckBox {
+        color: #CCCCCC;
+        spacing: 5px;
+    }
+    QDialog#settingsDialog QDialogButtonBox QPushButton {
+        background-color: #404040;
+        color: white;
+        border: 1px solid #555555;
+        padding: 8px 15px;
+        border-radius: 4px;
+    }
+    QDialog#settingsDialog QDialogButtonBox QPushButton:hover {
+        background-color: #505050;
+    }
+
+    QLabel#headerTitle {
+        color: #00A3CC;
+        margin-bottom: 10px;
+        padding: 5px;
+    }
+
+    QFrame#filterContainer, QFrame#filterContainer QFrame {
+        background-color: #2D2D2D;
+        border-radius: 6px;
+        margin: 5px;
+        padding: 5px;
+    }
+    QLabel#filterLabel {
+        color: white;
+        font-weight: bold;
+        font-size: 10pt;
+    }
+    QLabel#filterResults {
+        color: #888888;
+        font-size: 9pt;
+    }
+    QLineEdit#searchField {
+        background-color: #383838;
+        border: 1px solid #555555;
+        border-radius: 4px;
+        padding: 6px;
+        color: white;
+        font-size: 10pt;
+        min-width: 200px;
+    }
+    QLineEdit#searchField:focus {
+        border: 1px solid #4A90E2;
+        background-color: #404040;
+    }
+    QComboBox#statusFilter {
+        background-color: #383838;
+        border: 1px solid #555555;
+        border-radius: 4px;
+        padding: 6px;
+        color: white;
+        font-size: 10pt;
+        min-width: 100px;
+    }
+    QComboBox#statusFilter::drop-down {
+        border: none;
+        width: 20px;
+    }
+    QComboBox#statusFilter::down-arrow {
+        image: none;
+        border-left: 4px solid transparent;
+        border-right: 4px solid transparent;
+        border-top: 6px solid #CCCCCC;
+        margin-right: 6px;
+    }
+    QComboBox#statusFilter QAbstractItemView {
+        background-color: #383838;
+        border: 1px solid #555555;
+        selection-background-color: #4A90E2;
+        color: white;
+    }
+    QPushButton#clearFilters {
+        background-color: #FF6B6B;
+        border: none;
+        border-radius: 4px;
+        padding: 6px 12px;
+        color: white;
+        font-weight: bold;
+        font-size: 10pt;
+    }
+    QPushButton#clearFilters:hover {
+        background-color: #FF5252;
+    }
+    QPushButton#clearFilters:pressed {
+        background-color: #E53935;
+    }
+
+    QPushButton#tabAllVms, QPushButton#tabActiveConnections {
+        color: white;
+        border: none;
+        border-radius: 5px;
+        padding: 8px 20px;
+        font-size: 10pt;
+        font-weight: bold;
+    }
+    QPushButton#tabAllVms {
+        background-color: #00A3CC;
+    }
+    QPushButton#tabAllVms:hover {
+        background-color: #00BFFF;
+    }
+    QPushButton#tabAllVms:checked {
+        background-color: #00A3CC;
+    }
+    QPushButton#tabActiveConnections {
+        background-color: #FF6B35;
+    }
+    QPushButton#tabActiveConnections:hover {
+        background-color: #FF8555;
+    }
+    QPushButton#tabActiveConnections:checked {
+        background-color: #FF6B35;
+    }
+    QPushButton#tabAllVms:!checked, QPushButton#tabActiveConnections:!checked {
+        background-color: #383838;
+        color: #AAAAAA;
+    }
+
+    QWidget#footer, QWidget#footer QWidget {
+        background-color: #1E1E1E;
+        border-top: 1px solid #333333;
+    }
+    QLabel#statusDot {
+        color: #666666;
+        font-size: 10pt;
+    }
+    QLabel#statusDot[state="online"] {
+        color: #4CAF50;
+    }
+    QLabel#statusDot[state="offline"] {
+        color: #F44336;
+    }
+    QLabel#footerVmCounts {
+        color: #888888;
+        font-size: 8pt;
+        margin-left: 8px;
+    }
+    QLabel#footerMetrics {
+        color: #999999;
+        font-size: 8pt;
+        font-family: 'Segoe UI', 'Consolas', monospace;
+    }
+    QLabel#footerCopyright {
+        color: #666666;
+        font-size: 8pt;
+    }
+"""
+
+
+def set_style_property(widget, name, value):
+    """Sets a dynamic property used by a stylesheet selector and re-polishes the widget."""
+    widget.setProperty(name, value)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
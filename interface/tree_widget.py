@@ -1,6 +1,7 @@
 # tree_widget.py - Custom tree widget for VM groups
 
-from typing import Dict, Any, List, Optional
+import logging
+from typing import Dict, Any, List, Optional, Set
 from PyQt5.QtWidgets import (
     QTreeWidget, QTreeWidgetItem, QWidget, QVBoxLayout, QHBoxLayout, 
     QLabel, QPushButton, QHeaderView, QMenu, QAction, QInputDialog, 
@@ -15,6 +16,8 @@ from .widgets import VMWidget
 from .groups import GroupManager
 from api import ProxmoxController
 
+logger = logging.getLogger(__name__)
+
 
 class DraggableVMItem(QTreeWidgetItem):
     """Tree widget item representing a VM that can be dragged"""
@@ -186,8 +189,8 @@ class VMTreeWidget(QTreeWidget):
         self.dragging_item = None  # Track the item being dragged
         self.is_dragging = False   # Flag to prevent updates during drag
         
-        # Cache para otimizar atualizações
-        self.last_grouped_vms_hash = None
+        # Cache para otimizar atualizações: layout renderizado (grupos, ordem, nomes)
+        self.last_tree_layout = None
         
         # Debounce para refresh (evita múltiplos refreshes rápidos)
         self.refresh_timer = QTimer()
@@ -378,21 +381,19 @@ class VMTreeWidget(QTreeWidget):
         
         # Busca dados cached da MainWindow
         main_window = self.parent()
-        while main_window and not hasattr(main_window, 'unfiltered_vms_list'):
+        while main_window and not hasattr(main_window, 'unfiltered_vms'):
             main_window = main_window.parent()
         
-        if main_window and hasattr(main_window, 'unfiltered_vms_list') and main_window.unfiltered_vms_list:
-            print(f"🚀 Atualizando tree (debounced) com {len(main_window.unfiltered_vms_list)} VMs")
-            self.update_tree(main_window.unfiltered_vms_list)
+        if main_window and hasattr(main_window, 'unfiltered_vms') and main_window.unfiltered_vms:
+            logger.debug("Atualizando tree (debounced) com %d VMs", len(main_window.unfiltered_vms))
+            self.update_tree(list(main_window.unfiltered_vms.values()))
         else:
             # Se não tem dados cached, emite sinal para forçar atualização
-            print("⚠️ Sem dados cached, forçando atualização via thread")
+            logger.debug("Sem dados cached, forçando atualização via thread")
             self.vm_action_performed.emit()
     
     def _update_existing_vms_only(self, vms_list: List[Dict[str, Any]]):
-        """Updates only the data of existing VM widgets without rebuilding the tree"""
-        print("⚡ Atualização otimizada: apenas widgets das VMs")
-        
+        """Updates only the data of changed VM widgets without rebuilding the tree"""
         try:
             # Mapeia VMs por ID para acesso rápido
             vms_by_id = {vm.get('vmid'): vm for vm in vms_list}
@@ -416,11 +417,11 @@ class VMTreeWidget(QTreeWidget):
                             # Testa se o widget ainda é válido
                             vm_widget.isVisible()
                             
-                            vmid = vm_widget.vmid
-                            if vmid in vms_by_id:
-                                # Atualiza dados da VM sem recriar widget
-                                new_vm_data = vms_by_id[vmid]
+                            new_vm_data = vms_by_id.get(vm_widget.vmid)
+                            # Só atualiza widgets cujos dados mudaram
+                            if new_vm_data is not None and new_vm_data != vm_widget.vm_data:
                                 vm_widget.update_data(new_vm_data)
+                                vm_item.vm_data = new_vm_data
                         except RuntimeError:
                             # Widget foi deletado, ignora
                             continue
@@ -428,6 +429,102 @@ class VMTreeWidget(QTreeWidget):
             # Se a tree foi modificada durante iteração, ignora
             pass
     
+    def _build_tree_layout(self, sorted_groups: List[tuple], expand_groups_with_results: bool) -> tuple:
+        """Signature of what a full rebuild would render: group order, VM order and names"""
+        groups = tuple(
+            (group_name, tuple((vm.get('vmid'), vm.get('name')) for vm in vms))
+            for group_name, vms in sorted_groups
+        )
+        return (groups, expand_groups_with_results)
+    
+    def _removed_vmids_only(self, layout: tuple) -> Optional[set]:
+        """
+        If the new layout is the rendered one minus some VMs (same groups, same order),
+        returns the removed vmids. Returns None when a rebuild is required.
+        """
+        if self.last_tree_layout is None or self.topLevelItemCount() == 0:
+            return None
+        
+        old_groups, old_expand = self.last_tree_layout
+        new_groups, new_expand = layout
+        if old_expand != new_expand or [g for g, _ in old_groups] != [g for g, _ in new_groups]:
+            return None
+        
+        kept = {vmid for _, vms in new_groups for vmid, _ in vms}
+        for (_, old_vms), (_, new_vms) in zip(old_groups, new_groups):
+            if tuple(vm for vm in old_vms if vm[0] in kept) != new_vms:
+                return None
+        
+        return {vmid for _, vms in old_groups for vmid, _ in vms} - kept
+    
+    def _added_vms_only(self, layout: tuple) -> Optional[List[List[tuple]]]:
+        """
+        If the new layout is the rendered one plus some VMs (same groups, rendered VMs
+        in the same order), returns per group the (position, vmid) of each new VM in
+        ascending position. Returns None when a rebuild is required (including a
+        previously empty group receiving VMs, whose expansion the rebuild decides).
+        """
+        if self.last_tree_layout is None or self.topLevelItemCount() == 0:
+            return None
+        
+        old_groups, old_expand = self.last_tree_layout
+        new_groups, new_expand = layout
+        if old_expand != new_expand or [g for g, _ in old_groups] != [g for g, _ in new_groups]:
+            return None
+        
+        rendered = {vmid for _, vms in old_groups for vmid, _ in vms}
+        additions = []
+        for (_, old_vms), (_, new_vms) in zip(old_groups, new_groups):
+            if tuple(vm for vm in new_vms if vm[0] in rendered) != old_vms:
+                return None
+            if not old_vms and new_vms:
+                return None
+            additions.append([(pos, vm[0]) for pos, vm in enumerate(new_vms) if vm[0] not in rendered])
+        
+        return additions
+    
+    def insert_vms(self, additions: List[List[tuple]], vms_by_id: Dict[Any, Dict[str, Any]]):
+        """Inserts new VM rows at their positions (the other rows and widgets are kept)"""
+        for group_idx, group_additions in enumerate(additions):
+            if not group_additions:
+                continue
+            group_item = self.topLevelItem(group_idx)
+            
+            # Posições crescentes: cada inserção já encontra as anteriores no lugar
+            for pos, vmid in group_additions:
+                vm_item = self._create_vm_item(vms_by_id[vmid])
+                group_item.insertChild(pos, vm_item)
+                self.setItemWidget(vm_item, 0, vm_item.vm_widget)
+            
+            if isinstance(group_item, GroupItem):
+                group_item.update_display(group_item.childCount())
+                group_widget = self.itemWidget(group_item, 0)
+                if isinstance(group_widget, GroupWidget):
+                    group_widget.update_count(group_item.childCount())
+    
+    def _create_vm_item(self, vm_data: Dict[str, Any]) -> 'DraggableVMItem':
+        """Creates the VM widget and its tree item (the widget is set once the item is in the tree)"""
+        vm_widget = VMWidget(vm_data, self.controller, self.process_manager)
+        vm_widget.action_performed.connect(self.vm_action_performed)
+        vm_widget.process_registered.connect(self.process_registered)
+        return DraggableVMItem(vm_data, vm_widget)
+    
+    def remove_vms(self, vmids: set):
+        """Removes VM rows from the tree and updates the group counters"""
+        for group_idx in range(self.topLevelItemCount()):
+            group_item = self.topLevelItem(group_idx)
+            
+            for vm_idx in reversed(range(group_item.childCount())):
+                vm_item = group_item.child(vm_idx)
+                if isinstance(vm_item, DraggableVMItem) and vm_item.vmid in vmids:
+                    group_item.removeChild(vm_item)
+            
+            if isinstance(group_item, GroupItem) and group_item.vm_count != group_item.childCount():
+                group_item.update_display(group_item.childCount())
+                group_widget = self.itemWidget(group_item, 0)
+                if isinstance(group_widget, GroupWidget):
+                    group_widget.update_count(group_item.childCount())
+    
     def _safe_clear_tree(self):
         """Remove todos os itens da tree de forma segura para evitar erros Qt model"""
         try:
@@ -452,6 +549,57 @@ class VMTreeWidget(QTreeWidget):
         if self.is_dragging:
             return
         
+        # Get VMs organized by groups, in display order
+        grouped_vms = self.group_manager.get_vms_grouped_by_name(vms_list)
+        sorted_groups = [
+            (group_name, self._sort_vms_in_group(vms))
+            for group_name, vms in self._sort_groups(grouped_vms)
+        ]
+        layout = self._build_tree_layout(sorted_groups, expand_groups_with_results)
+        
+        # Layout igual ao renderizado: apenas atualiza os widgets que mudaram
+        if layout == self.last_tree_layout and self.topLevelItemCount() > 0:
+            # Um único repaint para todos os widgets atualizados
+            self.blockSignals(True)
+            self.setUpdatesEnabled(False)
+            try:
+                self._update_existing_vms_only(vms_list)
+            finally:
+                self.blockSignals(False)
+                self.setUpdatesEnabled(True)
+            return
+        
+        # Apenas VMs removidas (ex: refinando a busca): remove as linhas sem reconstruir
+        removed_vmids = self._removed_vmids_only(layout)
+        if removed_vmids is not None:
+            self.blockSignals(True)
+            self.setUpdatesEnabled(False)
+            try:
+                self.remove_vms(removed_vmids)
+                self.last_tree_layout = layout
+                self._update_existing_vms_only(vms_list)
+            finally:
+                self.blockSignals(False)
+                self.setUpdatesEnabled(True)
+            return
+        
+        # Apenas VMs novas (ex: carregamento progressivo, busca mais ampla): insere só as linhas novas
+        additions = self._added_vms_only(layout)
+        if additions is not None:
+            self.blockSignals(True)
+            self.setUpdatesEnabled(False)
+            try:
+                self._update_existing_vms_only(vms_list)
+                self.insert_vms(additions, {vm.get('vmid'): vm for vm in vms_list})
+                self.last_tree_layout = layout
+                self.resizeColumnToContents(0)
+            finally:
+                self.blockSignals(False)
+                self.setUpdatesEnabled(True)
+            return
+        
+        self.last_tree_layout = layout
+        
         # Save current expansion state (sem sobrescrever o persistido ainda)
         current_expanded_groups = self._get_current_expansion_state()
         
@@ -472,34 +620,6 @@ class VMTreeWidget(QTreeWidget):
         # Clear current tree safely (evita erro Qt model)
         self._safe_clear_tree()
         
-        # Get VMs organized by groups
-        grouped_vms = self.group_manager.get_vms_grouped_by_name(vms_list)
-        
-        # Gera hash dos grupos para verificar se houve mudança estrutural
-        import hashlib
-        import json
-        group_structure = {
-            group_name: [vm.get('vmid') for vm in vm_list] 
-            for group_name, vm_list in grouped_vms.items()
-        }
-        current_hash = hashlib.md5(json.dumps(group_structure, sort_keys=True).encode()).hexdigest()
-        
-        # Se estrutura de grupos não mudou, apenas atualiza VMs individuais
-        if (current_hash == self.last_grouped_vms_hash and 
-            not expand_groups_with_results and 
-            self.topLevelItemCount() > 0):
-            self.last_grouped_vms_hash = current_hash
-            # Reativa atualizações para permitir update dos widgets
-            self.blockSignals(False)
-            self.setUpdatesEnabled(True)
-            self._update_existing_vms_only(vms_list)
-            return
-        
-        self.last_grouped_vms_hash = current_hash
-        
-        # Sort groups alphabetically, keeping "Ungrouped" always at the end
-        sorted_groups = self._sort_groups(grouped_vms)
-        
         # Add groups and VMs to tree
         for group_name, vms in sorted_groups:
             # Create group item
@@ -510,20 +630,13 @@ class VMTreeWidget(QTreeWidget):
             group_widget = group_item.create_widget(self)
             self.setItemWidget(group_item, 0, group_widget)
             
-            # Sort VMs within group by status (running first) then alphabetically
-            sorted_vms = self._sort_vms_in_group(vms)
-            
-            # Add VMs to group
-            for vm_data in sorted_vms:
-                vm_widget = VMWidget(vm_data, self.controller, self.process_manager)
-                vm_widget.action_performed.connect(self.vm_action_performed)
-                vm_widget.process_registered.connect(self.process_registered)
-                
-                vm_item = DraggableVMItem(vm_data, vm_widget)
+            # Add VMs to group (already sorted by status, then alphabetically)
+            for vm_data in vms:
+                vm_item = self._create_vm_item(vm_data)
                 group_item.addChild(vm_item)
                 
                 # Set custom widget for item
-                self.setItemWidget(vm_item, 0, vm_widget)
+                self.setItemWidget(vm_item, 0, vm_item.vm_widget)
             
             # Determine expansion state
             should_expand = False
@@ -554,29 +667,6 @@ class VMTreeWidget(QTreeWidget):
         self.blockSignals(False)
         self.setUpdatesEnabled(True)
     
-    def update_single_vm(self, vm_data: Dict[str, Any]):
-        """Updates a single VM widget without rebuilding the entire tree"""
-        vmid = vm_data.get('vmid')
-        
-        # Find the VM item in the tree
-        for group_idx in range(self.topLevelItemCount()):
-            group_item = self.topLevelItem(group_idx)
-            
-            for vm_idx in range(group_item.childCount()):
-                vm_item = group_item.child(vm_idx)
-                
-                if isinstance(vm_item, DraggableVMItem):
-                    existing_vmid = vm_item.vm_data.get('vmid')
-                    
-                    if existing_vmid == vmid:
-                        # Found the VM, update its widget
-                        vm_widget = self.itemWidget(vm_item, 0)
-                        if isinstance(vm_widget, VMWidget):
-                            vm_widget.update_data(vm_data)
-                        return
-        
-        # VM not found in tree, might be new - do nothing (será adicionada no próximo update completo)
-    
     def _sort_vms_in_group(self, vms: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Sorts VMs within a group by status (running first) then alphabetically"""
         def sort_key(vm: Dict[str, Any]):
@@ -674,8 +764,6 @@ class VMTreeWidget(QTreeWidget):
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         
         # Use QTimer with multiple attempts for smooth restoration
-        from PyQt5.QtCore import QTimer
-        
         attempt_count = 0
         max_attempts = 5
         
@@ -1080,8 +1168,8 @@ class VMTreeWidget(QTreeWidget):
         """Called when hover timer expires - mouse has been away for a while"""
         self.mouse_over_widget = False
     
-    def update_all_vm_buttons(self):
-        """Atualiza os botões de todas as VMs para refletir status dos processos"""
+    def update_all_vm_buttons(self, vmids: Optional[Set[int]] = None):
+        """Atualiza os botões das VMs (todas, ou só as de vmids) para refletir status dos processos"""
         try:
             root = self.invisibleRootItem()
             for i in range(root.childCount()):
@@ -1100,6 +1188,8 @@ class VMTreeWidget(QTreeWidget):
                         try:
                             # Testa se o widget ainda é válido
                             vm_item.vm_widget.isVisible()  # Método que falhará se widget foi deletado
+                            if vmids is not None and vm_item.vm_widget.vmid not in vmids:
+                                continue
                             vm_item.vm_widget.update_action_buttons()
                         except RuntimeError:
                             # Widget foi deletado, ignora
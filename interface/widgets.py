@@ -1,6 +1,8 @@
 # widgets.py - Versão otimizada
 
-from typing import Dict, Any, Optional
+import re
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
 )
@@ -14,11 +16,47 @@ from utils.utilities import ViewerWorker
 from utils import ProcessManager
 
 
+# Cores (normal, hover, pressed) dos botões de ação principais
+SPICE_BUTTON_COLORS = ("#DE264D", "#e5395b", "#E55A9D")  # SPICE/noVNC
+CONNECT_BUTTON_COLORS = ("#007ACC", "#0099FF", "#005999")  # Azul para RDP/SSH
+START_BUTTON_COLORS = ("#28A745", "#30C750", "#1F7A35")
+
+
+@lru_cache(maxsize=None)
+def action_button_style(colors: Tuple[str, str, str]) -> str:
+    """Stylesheet de um botão de ação principal (montada uma vez por combinação de cores)"""
+    color, hover_color, pressed_color = colors
+    return f"""
+        QPushButton {{ 
+            height: 30px; border-radius: 4px; font-size: 9pt; font-weight: bold; color: white; 
+            background-color: {color}; border: 1px solid {color};
+        }}
+        QPushButton:hover {{ background-color: {hover_color}; border: 1px solid {hover_color}; }}
+        QPushButton:pressed {{ background-color: {pressed_color}; border: 1px solid {pressed_color};
+            padding-top: 3px; padding-left: 3px;
+        }}
+    """
+
+
 class VMWidget(QWidget):
     """ Widget personalizado para exibir o status e ações de uma VM. """
     action_performed = pyqtSignal()
     process_registered = pyqtSignal()  # Sinal emitido quando processo é registrado
     
+    # Identificadores de ostype do Proxmox
+    # win10, win11, win8, win7, w2k22, w2k19, w2k16, w2k12, w2k8
+    WINDOWS_OSTYPES = ('win', 'w2k')
+    # l24 = Linux 2.4 Kernel, l26 = Linux 2.6+ Kernel
+    LINUX_OSTYPES = ('l24', 'l26', 'linux', 'ubuntu', 'debian', 'centos', 
+                     'fedora', 'opensuse', 'archlinux', 'gentoo', 'alpine')
+    # Uma alternação por família: uma única varredura do ostype em vez de um `in` por identificador
+    WINDOWS_OSTYPE_RE = re.compile("|".join(map(re.escape, WINDOWS_OSTYPES)), re.IGNORECASE)
+    LINUX_OSTYPE_RE = re.compile("|".join(map(re.escape, LINUX_OSTYPES)), re.IGNORECASE)
+    # Valores exatos do enum de ostype (qemu e lxc): caminho rápido por hash antes da regex
+    WINDOWS_OSTYPE_VALUES = frozenset({'win11', 'win10', 'win8', 'win7', 'w2k8', 'w2k3', 'w2k'})
+    LINUX_OSTYPE_VALUES = frozenset({'l26', 'l24', 'debian', 'ubuntu', 'centos', 'fedora',
+                                     'opensuse', 'archlinux', 'gentoo', 'alpine'})
+    
     def __init__(self, vm_data: Dict[str, Any], controller: ProxmoxController, process_manager: ProcessManager):
         super().__init__()
         self.controller = controller
@@ -31,6 +69,11 @@ class VMWidget(QWidget):
         self.name = vm_data.get('name', 'VM Desconhecida')
         self.status = vm_data.get('status', 'unknown')
         
+        # Classificação de SO/display, recalculada só quando ostype/vga mudam
+        self.os_key = None
+        self.os_kind = 'other'  # 'windows', 'linux' ou 'other'
+        self.has_spice = False
+        
         # LABELS DE MÉTRICAS
         self.status_label = QLabel() 
         self.cpu_usage_label = QLabel()
@@ -52,6 +95,13 @@ class VMWidget(QWidget):
         self.name = new_vm_data.get('name', self.name)
         self.status = new_vm_data.get('status', self.status) # Novo status
         
+        os_key = (new_vm_data.get('ostype', ''), new_vm_data.get('vga', ''))
+        if os_key != self.os_key:
+            self.os_key = os_key
+            self.os_kind = self._classify_ostype(os_key[0])
+            # O display type 'qxl' é o usado para SPICE
+            self.has_spice = 'qxl' in os_key[1].lower()
+        
         # 2. Atualiza os componentes da UI
         self.update_metrics_display()
         self.update_status_display()
@@ -282,21 +332,8 @@ class VMWidget(QWidget):
                 else:
                     text = "SPICE"
                 self.spice_main_btn.setText(text)
-                color = "#DE264D" 
-                hover_color = "#e5395b"
-                pressed_color = "#E55A9D"
                 self.spice_main_btn.setVisible(True)
-                
-                self.spice_main_btn.setStyleSheet(f"""
-                    QPushButton {{ 
-                        height: 30px; border-radius: 4px; font-size: 9pt; font-weight: bold; color: white; 
-                        background-color: {color}; border: 1px solid {color};
-                    }}
-                    QPushButton:hover {{ background-color: {hover_color}; border: 1px solid {hover_color}; }}
-                    QPushButton:pressed {{ background-color: {pressed_color}; border: 1px solid {pressed_color};
-                        padding-top: 3px; padding-left: 3px;
-                    }}
-                """)
+                self._apply_action_style(self.spice_main_btn, SPICE_BUTTON_COLORS)
             else:
                 self.spice_main_btn.setVisible(False)
         except (RuntimeError, AttributeError):
@@ -311,21 +348,8 @@ class VMWidget(QWidget):
             else:
                 text = "noVNC"
             self.novnc_main_btn.setText(text)
-            color = "#DE264D"  
-            hover_color = "#e5395b"
-            pressed_color = "#E55A9D"
             self.novnc_main_btn.setVisible(True)
-            
-            self.novnc_main_btn.setStyleSheet(f"""
-                QPushButton {{ 
-                    height: 30px; border-radius: 4px; font-size: 9pt; font-weight: bold; color: white; 
-                    background-color: {color}; border: 1px solid {color};
-                }}
-                QPushButton:hover {{ background-color: {hover_color}; border: 1px solid {hover_color}; }}
-                QPushButton:pressed {{ background-color: {pressed_color}; border: 1px solid {pressed_color};
-                    padding-top: 3px; padding-left: 3px;
-                }}
-            """)
+            self._apply_action_style(self.novnc_main_btn, SPICE_BUTTON_COLORS)
         else:
             self.novnc_main_btn.setVisible(False)
         
@@ -337,21 +361,8 @@ class VMWidget(QWidget):
             else:
                 text = "RDP"
             self.connect_btn.setText(text)
-            color = "#007ACC"  # Azul para RDP
-            hover_color = "#0099FF"
-            pressed_color = "#005999"
             self.connect_btn.setVisible(True)
-            
-            self.connect_btn.setStyleSheet(f"""
-                QPushButton {{ 
-                    height: 30px; border-radius: 4px; font-size: 9pt; font-weight: bold; color: white; 
-                    background-color: {color}; border: 1px solid {color};
-                }}
-                QPushButton:hover {{ background-color: {hover_color}; border: 1px solid {hover_color}; }}
-                QPushButton:pressed {{ background-color: {pressed_color}; border: 1px solid {pressed_color};
-                    padding-top: 3px; padding-left: 3px;
-                }}
-            """)
+            self._apply_action_style(self.connect_btn, CONNECT_BUTTON_COLORS)
         elif is_running and is_linux:
             # Usa (+) se minimizado, (-) se em primeiro plano, nada se não ativo
             if active_protocol == 'ssh':
@@ -359,41 +370,15 @@ class VMWidget(QWidget):
             else:
                 text = "SSH"
             self.connect_btn.setText(text)
-            color = "#007ACC"  # Azul para SSH
-            hover_color = "#0099FF"
-            pressed_color = "#005999"
             self.connect_btn.setVisible(True)
-            
-            self.connect_btn.setStyleSheet(f"""
-                QPushButton {{ 
-                    height: 30px; border-radius: 4px; font-size: 9pt; font-weight: bold; color: white; 
-                    background-color: {color}; border: 1px solid {color};
-                }}
-                QPushButton:hover {{ background-color: {hover_color}; border: 1px solid {hover_color}; }}
-                QPushButton:pressed {{ background-color: {pressed_color}; border: 1px solid {pressed_color};
-                    padding-top: 3px; padding-left: 3px;
-                }}
-            """)
+            self._apply_action_style(self.connect_btn, CONNECT_BUTTON_COLORS)
         elif is_running:
             # Para VMs que não são Windows nem Linux rodando, esconde o botão RDP/SSH
             self.connect_btn.setVisible(False)
         else:
             self.connect_btn.setText("START VM")
-            color = "#28A745"
-            hover_color = "#30C750"
-            pressed_color = "#1F7A35"
             self.connect_btn.setVisible(True)
-            
-            self.connect_btn.setStyleSheet(f"""
-                QPushButton {{ 
-                    height: 30px; border-radius: 4px; font-size: 9pt; font-weight: bold; color: white; 
-                    background-color: {color}; border: 1px solid {color};
-                }}
-                QPushButton:hover {{ background-color: {hover_color}; border: 1px solid {hover_color}; }}
-                QPushButton:pressed {{ background-color: {pressed_color}; border: 1px solid {pressed_color};
-                    padding-top: 3px; padding-left: 3px;
-                }}
-            """)
+            self._apply_action_style(self.connect_btn, START_BUTTON_COLORS)
         
         # Botões de controle (Shutdown, Reboot, SSH, VNC)
         self.stop_btn.setEnabled(is_running)
@@ -410,32 +395,38 @@ class VMWidget(QWidget):
         # Manter VNC escondido se não for usado ativamente
         self.vnc_btn.setHidden(True)
     
+    @staticmethod
+    def _apply_action_style(button: QPushButton, colors: Tuple[str, str, str]):
+        """Aplica o estilo do botão; setStyleSheet sempre re-polisha, então só troca se mudou"""
+        style = action_button_style(colors)
+        if button.styleSheet() != style:
+            button.setStyleSheet(style)
+    
     def _has_spice_display(self) -> bool:
         """Detecta se a VM tem SPICE configurado como display"""
-        vga = self.vm_data.get('vga', '').lower()
-        # Verifica se o display type contém 'qxl' (que é usado para SPICE)
-        return 'qxl' in vga
+        return self.has_spice
+    
+    @classmethod
+    def _classify_ostype(cls, ostype: str) -> str:
+        """Classifica o ostype retornado pela API do Proxmox em 'windows', 'linux' ou 'other'"""
+        if ostype in cls.WINDOWS_OSTYPE_VALUES:
+            return 'windows'
+        if ostype in cls.LINUX_OSTYPE_VALUES:
+            return 'linux'
+        # Valores fora do enum conhecido (ou com caixa diferente)
+        if cls.WINDOWS_OSTYPE_RE.search(ostype):
+            return 'windows'
+        if cls.LINUX_OSTYPE_RE.search(ostype):
+            return 'linux'
+        return 'other'
     
     def _is_windows_vm(self) -> bool:
         """Detecta se a VM é Windows baseado no ostype retornado pela API do Proxmox"""
-        ostype = self.vm_data.get('ostype', '').lower()
-        
-        # Identificadores Windows comuns no Proxmox
-        # win10, win11, win8, win7, w2k22, w2k19, w2k16, w2k12, w2k8
-        windows_ostypes = ['win', 'w2k']
-        
-        return any(win_type in ostype for win_type in windows_ostypes)
+        return self.os_kind == 'windows'
     
     def _is_linux_vm(self) -> bool:
         """Detecta se a VM é Linux baseado no ostype retornado pela API do Proxmox"""
-        ostype = self.vm_data.get('ostype', '').lower()
-        
-        # Identificadores Linux comuns no Proxmox
-        # l24 = Linux 2.4 Kernel, l26 = Linux 2.6+ Kernel
-        linux_ostypes = ['l24', 'l26', 'linux', 'ubuntu', 'debian', 'centos', 
-                         'fedora', 'opensuse', 'archlinux', 'gentoo', 'alpine']
-        
-        return any(linux_type in ostype for linux_type in linux_ostypes) 
+        return self.os_kind == 'linux'
 
     # --- Métodos de Clique (Ações) ---
 
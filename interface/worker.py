@@ -1,9 +1,14 @@
 # worker.py
 
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PyQt5.QtCore import QRunnable, pyqtSignal, QObject, QThreadPool, pyqtSlot
 import traceback
 import sys
 
+# Número de VMs consultadas em paralelo (chamadas à API são I/O-bound)
+VM_FETCH_WORKERS = 10
+
 # --- Classe para emitir sinais de volta para a Thread Principal ---
 class WorkerSignals(QObject):
     """
@@ -34,6 +39,11 @@ class Worker(QRunnable):
         self.args = args
         self.kwargs = kwargs
         self.signals = WorkerSignals()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        """ Descarta o resultado: uma chamada já em andamento não é interrompida, mas nada é emitido. """
+        self.cancelled.set()
 
     @pyqtSlot()
     def run(self):
@@ -43,27 +53,86 @@ class Worker(QRunnable):
             result = self.fn(*self.args, **self.kwargs)
         except:
             # Captura e envia o erro de volta para a Thread Principal
-            traceback.print_exc()
-            exctype, value = sys.exc_info()[:2]
-            self.signals.error.emit((exctype, value, traceback.format_exc()))
+            if not self.cancelled.is_set():
+                traceback.print_exc()
+                exctype, value = sys.exc_info()[:2]
+                self.signals.error.emit((exctype, value, traceback.format_exc()))
         else:
             # Envia o resultado de volta para a Thread Principal
-            self.signals.result.emit(result)  
+            if not self.cancelled.is_set():
+                self.signals.result.emit(result)  
         finally:
             # Sinaliza que o trabalho (thread) terminou
             self.signals.finished.emit()
 
 
+def index_vm(vm):
+    """
+    Caches the derived fields used by the window's filters on the VM dict.
+    Runs in the worker thread, so the GUI thread receives VMs ready to filter.
+    """
+    # Nome e vmid num único texto: o separador \x00 nunca aparece na busca,
+    # então um termo não casa atravessando os dois campos
+    vm['_search_blob'] = f"{vm.get('name', '')}\x00{vm.get('vmid', '')}".lower()
+    vm['_running'] = vm.get('status', 'unknown').upper() == "RUNNING"
+
+
+def fetch_vm_details(api_client, vm):
+    """
+    Enriquece o dicionário básico de uma VM (vindo de get_vms_list) com ostype/vga e IPs,
+    e já calcula os campos derivados dos filtros (index_vm).
+    Status, CPU e memória já vêm no /cluster/resources, então não há chamada de status por VM.
+    Retorna None se a VM não tiver vmid/type. Seguro para rodar em threads paralelas.
+    """
+    vmid = vm.get('vmid')
+    vm_type = vm.get('type')
+    
+    if vmid is None or vm_type is None:
+        return None
+    
+    # Get config
+    try:
+        vm_config = api_client.cached_call(
+            api_client.get_vm_config, api_client.VM_CONFIG_TTL, vmid, vm_type)
+        if vm_config:
+            if 'ostype' in vm_config:
+                vm['ostype'] = vm_config['ostype']
+            if 'vga' in vm_config:
+                vm['vga'] = vm_config['vga']
+    except:
+        pass
+    
+    # Get IPs
+    if vm.get('status') == 'running':
+        try:
+            ip_addresses = api_client.cached_call(
+                api_client.get_vm_network_info, api_client.VM_NETWORK_TTL, vmid, vm_type)
+            vm['ip_addresses'] = ip_addresses
+        except:
+            vm['ip_addresses'] = []
+    else:
+        vm['ip_addresses'] = []
+    
+    index_vm(vm)
+    return vm
+
+
 class ProgressiveVMWorker(QRunnable):
     """
     Worker que carrega VMs progressivamente, emitindo cada uma conforme fica pronta.
+    Os detalhes de cada VM são buscados em paralelo (I/O-bound).
     """
     def __init__(self, api_client):
         super().__init__()
         self.api_client = api_client
         self.signals = ProgressiveWorkerSignals()
+        self.cancelled = threading.Event()
         self.setAutoDelete(True)
     
+    def cancel(self):
+        """Interrompe o carregamento: VMs ainda não buscadas são descartadas e nada mais é emitido"""
+        self.cancelled.set()
+    
     @pyqtSlot()
     def run(self):
         """Carrega VMs e emite cada uma progressivamente"""
@@ -71,49 +140,25 @@ class ProgressiveVMWorker(QRunnable):
             # Busca lista básica de VMs
             vms_list = self.api_client.get_vms_list()
             
-            if vms_list:
-                for vm in vms_list:
-                    vmid = vm.get('vmid')
-                    vm_type = vm.get('type')
+            if vms_list and not self.cancelled.is_set():
+                with ThreadPoolExecutor(max_workers=VM_FETCH_WORKERS) as executor:
+                    futures = [executor.submit(fetch_vm_details, self.api_client, vm) for vm in vms_list]
                     
-                    if vmid is None or vm_type is None:
-                        continue
-                    
-                    # Get detailed status
-                    try:
-                        detailed_status = self.api_client.get_vm_current_status(vmid, vm_type)
-                        if detailed_status:
-                            vm.update(detailed_status)
-                    except:
-                        pass
-                    
-                    # Get config
-                    try:
-                        vm_config = self.api_client.get_vm_config(vmid, vm_type)
-                        if vm_config:
-                            if 'ostype' in vm_config:
-                                vm['ostype'] = vm_config['ostype']
-                            if 'vga' in vm_config:
-                                vm['vga'] = vm_config['vga']
-                    except:
-                        pass
-                    
-                    # Get IPs
-                    if vm.get('status') == 'running':
-                        try:
-                            ip_addresses = self.api_client.get_vm_network_info(vmid, vm_type)
-                            vm['ip_addresses'] = ip_addresses
-                        except:
-                            vm['ip_addresses'] = []
-                    else:
-                        vm['ip_addresses'] = []
-                    
-                    # EMITE A VM IMEDIATAMENTE
-                    self.signals.progress.emit(vm)
+                    # EMITE CADA VM ASSIM QUE FICA PRONTA
+                    for future in as_completed(futures):
+                        if self.cancelled.is_set():
+                            # Não espera pelas consultas que ainda estão na fila
+                            for pending in futures:
+                                pending.cancel()
+                            break
+                        vm = future.result()
+                        if vm:
+                            self.signals.progress.emit(vm)
             
         except Exception as e:
-            traceback.print_exc()
-            exctype, value = sys.exc_info()[:2]
-            self.signals.error.emit((exctype, value, traceback.format_exc()))
+            if not self.cancelled.is_set():
+                traceback.print_exc()
+                exctype, value = sys.exc_info()[:2]
+                self.signals.error.emit((exctype, value, traceback.format_exc()))
         finally:
-            self.signals.finished.emit()
\ No newline at end of file
+            self.signals.finished.emit()
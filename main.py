@@ -1,5 +1,6 @@
 import sys
 import os
+import logging
 import atexit
 import tempfile
 import subprocess
@@ -9,6 +10,7 @@ from PyQt5.QtWidgets import QApplication, QMessageBox
 from PyQt5.QtGui import QIcon, QColor, QPalette
 from PyQt5.QtCore import QSettings, Qt
 from interface import LoginWindow
+from interface.styles import DarkProxyStyle
 
 # Configurações globais da Aplicação
 APP_ORGANIZATION = "PyQtProxmoxApp"
@@ -66,7 +68,7 @@ def show_already_running_message():
 
 def apply_dark_theme(app: QApplication):
     """ Aplica o tema dark (Fusion) na aplicação. """
-    app.setStyle('Fusion')
+    app.setStyle(DarkProxyStyle('Fusion'))
     palette = QPalette()
     palette.setColor(QPalette.Window, QColor(30, 30, 30))
     palette.setColor(QPalette.WindowText, Qt.white)
@@ -87,6 +89,9 @@ def main():
         show_already_running_message()
         return
     
+    # Logs de debug (atualizações periódicas) ficam desligados por padrão
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    
     # 1. Configurações de aplicação para QSettings
     QApplication.setOrganizationName(APP_ORGANIZATION) 
     QApplication.setApplicationName(APP_NAME)
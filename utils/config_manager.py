@@ -2,9 +2,16 @@
 Config Manager - Handles JSON configuration files for ProxManager
 """
 
+import copy
 import json
 import os
-from typing import Dict, Any
+import threading
+from typing import Dict, Any, Tuple
+
+# configs.json já parseado, por caminho: {path: ((mtime_ns, size), data)}.
+# Compartilhado entre instâncias (controller e spice viewer criam as suas).
+_configs_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+_configs_cache_lock = threading.Lock()
 
 
 class ConfigManager:
@@ -16,11 +23,24 @@ class ConfigManager:
         self.login_file = os.path.join(base_path, "login.json")
     
     def load_configs(self) -> Dict[str, Any]:
-        """Load application configurations"""
+        """Load application configurations (re-parsed only when the file changes)"""
         try:
             if os.path.exists(self.configs_file):
-                with open(self.configs_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                st = os.stat(self.configs_file)
+                key = (st.st_mtime_ns, st.st_size)
+                
+                with _configs_cache_lock:
+                    cached = _configs_cache.get(self.configs_file)
+                if cached is None or cached[0] != key:
+                    with open(self.configs_file, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    with _configs_cache_lock:
+                        _configs_cache[self.configs_file] = (key, data)
+                else:
+                    data = cached[1]
+                
+                # Cópia: quem chama costuma alterar o dicionário antes de salvar
+                return copy.deepcopy(data)
         except Exception as e:
             print(f"Error loading configs: {e}")
         
@@ -42,11 +62,21 @@ class ConfigManager:
             os.makedirs(self.base_path, exist_ok=True)
             with open(self.configs_file, 'w', encoding='utf-8') as f:
                 json.dump(configs, f, indent=4, ensure_ascii=False)
+            with _configs_cache_lock:
+                _configs_cache.pop(self.configs_file, None)
             return True
         except Exception as e:
             print(f"Error saving configs: {e}")
             return False
     
+    def update_section(self, section: str, values: Dict[str, Any]) -> bool:
+        """Replace one top-level section (read-modify-write; no write if unchanged)"""
+        configs = self.load_configs()
+        if configs.get(section) == values:
+            return True
+        configs[section] = values
+        return self.save_configs(configs)
+    
     def load_login_data(self) -> Dict[str, Any]:
         """Load login credentials"""
         try:
@@ -1,8 +1,13 @@
 # process_manager.py - Gerencia processos abertos de VMs
 
+import ctypes
+from ctypes import wintypes
 import os
 import platform
-from typing import Dict, Optional, Tuple
+import subprocess
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 
@@ -32,9 +37,6 @@ class ProcessManager:
         # Se for Windows, tenta cachear o handle imediatamente (em background)
         if self.is_windows:
             # Aguarda um pouco para a janela ser criada
-            import threading
-            import time
-            
             def cache_handle():
                 # Tenta múltiplas vezes com intervalos curtos
                 for attempt in range(5):  # 5 tentativas
@@ -78,9 +80,6 @@ class ProcessManager:
         try:
             if self.is_windows:
                 # No Windows, usa método mais rápido com ctypes
-                import ctypes
-                import ctypes.wintypes
-                
                 PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
                 kernel32 = ctypes.windll.kernel32
                 
@@ -88,7 +87,7 @@ class ProcessManager:
                 handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
                 if handle:
                     # Verifica código de saída
-                    exit_code = ctypes.wintypes.DWORD()
+                    exit_code = wintypes.DWORD()
                     if kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
                         kernel32.CloseHandle(handle)
                         # 259 (STILL_ACTIVE) significa que ainda está rodando
@@ -209,9 +208,6 @@ class ProcessManager:
     def _bring_to_front_windows_fallback(self, process_info: ProcessInfo) -> bool:
         """Método alternativo usando ctypes (mais rápido, sem pywin32)"""
         try:
-            import ctypes
-            from ctypes import wintypes
-            
             # Define constantes
             SW_RESTORE = 9
             SW_SHOW = 5
@@ -271,8 +267,6 @@ class ProcessManager:
     def _bring_to_front_linux(self, process_info: ProcessInfo) -> bool:
         """Traz janela para frente no Linux usando wmctrl ou xdotool"""
         try:
-            import subprocess
-            
             # Tenta usar wmctrl primeiro
             try:
                 # Lista janelas e encontra pela PID
@@ -322,8 +316,8 @@ class ProcessManager:
         if vmid in self.processes:
             del self.processes[vmid]
     
-    def cleanup_dead_processes(self) -> None:
-        """Remove processos que não estão mais rodando"""
+    def cleanup_dead_processes(self) -> List[int]:
+        """Remove processos que não estão mais rodando e retorna os vmids removidos"""
         dead_vmids = []
         
         for vmid, process_info in self.processes.items():
@@ -332,6 +326,8 @@ class ProcessManager:
         
         for vmid in dead_vmids:
             del self.processes[vmid]
+        
+        return dead_vmids
     
     def is_window_minimized(self, vmid: int) -> bool:
         """
@@ -357,9 +353,6 @@ class ProcessManager:
         
         # Fallback: busca janela por PID
         try:
-            import ctypes
-            from ctypes import wintypes
-            
             user32 = ctypes.windll.user32
             minimized = [False]
             found = [False]
@@ -411,9 +404,6 @@ class ProcessManager:
         
         # Fallback: busca janela por PID e minimiza
         try:
-            import ctypes
-            from ctypes import wintypes
-            
             user32 = ctypes.windll.user32
             SW_MINIMIZE = 6
             success = [False]